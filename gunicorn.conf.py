@@ -0,0 +1,17 @@
+import os
+
+# Django keeps one persistent database connection per worker thread, so
+# workers * threads is also the size of each dyno's connection pool.
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+
+def post_worker_init(worker):
+    # Compile every template before the worker takes its first request.
+    from portfolio.startup import warm_templates
+    worker.log.info('Warmed %d templates', warm_templates())
+
+
+def worker_exit(server, worker):
+    from portfolio.db import pool_stats
+    worker.log.info('Database connections: %s', pool_stats())
@@ -1,16 +1,95 @@
-from django.contrib import admin
-from .models import About, Competency, Reason, Message, PastWork
+import csv
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from .bulk import export_response, format_from_name, import_pastworks, uploaded_rows
+from .forms import ImportForm
+from .models import About, ArchivedMessage, Competency, Reason, Message, PastWork, OutboxEmail, Tool
 
 admin.site.register(About)
 admin.site.register(Competency)
 admin.site.register(Reason)
 
+# Row errors listed after an import; the rest are only counted.
+IMPORT_ERRORS_SHOWN = 20
+
+
+def export_action(file_format):
+    def export(modeladmin, request, queryset):
+        return export_response(queryset, file_format, modeladmin.model._meta.verbose_name_plural.replace(' ', '_'))
+
+    export.__name__ = f'export_{file_format}'
+    export.short_description = f'Export selected %(verbose_name_plural)s as {file_format.upper()}'
+    return export
+
 
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('email', 'date',)
+    actions = [export_action('csv'), export_action('json')]
+
+
+@admin.register(ArchivedMessage)
+class ArchivedMessageAdmin(admin.ModelAdmin):
+    list_display = ('email', 'reason', 'date')
+    date_hierarchy = 'date'
 
 
 @admin.register(PastWork)
 class PastWorkAdmin(admin.ModelAdmin):
     list_display = ('name', 'date_added', 'date_modified')
+    list_filter = ('tools',)
+    # Derived from tools_used on every save; editing it here would be overwritten.
+    readonly_fields = ('tools',)
+    actions = [export_action('csv'), export_action('json')]
+    change_list_template = 'admin/portfolio/pastwork/change_list.html'
+
+    def get_urls(self):
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='portfolio_pastwork_import'),
+            *super().get_urls(),
+        ]
+
+    def import_view(self, request):
+        if not (self.has_add_permission(request) and self.has_change_permission(request)):
+            raise PermissionDenied
+        form = ImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            file_format = form.cleaned_data['format'] or format_from_name(upload.name)
+            try:
+                result = import_pastworks(uploaded_rows(upload, file_format))
+            except (ValueError, csv.Error) as error:
+                form.add_error('file', f'The file could not be read: {error}')
+            else:
+                self.message_user(request, f'Created {result["created"]} and updated {result["updated"]} '
+                                           f'past work(s).')
+                for number, message in result['errors'][:IMPORT_ERRORS_SHOWN]:
+                    self.message_user(request, f'Row {number} was skipped: {message}', messages.WARNING)
+                if len(result['errors']) > IMPORT_ERRORS_SHOWN:
+                    self.message_user(request, f'{len(result["errors"]) - IMPORT_ERRORS_SHOWN} more row(s) were '
+                                               f'skipped.', messages.WARNING)
+                return redirect('admin:portfolio_pastwork_changelist')
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Import past works',
+            'opts': self.model._meta,
+            'form': form,
+        }
+        return TemplateResponse(request, 'admin/portfolio/pastwork/import.html', context)
+
+
+@admin.register(Tool)
+class ToolAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    prepopulated_fields = {'slug': ('name',)}
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'date_sent')
+    list_filter = ('status',)
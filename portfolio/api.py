@@ -0,0 +1,52 @@
+from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.generic import View
+from .cache import get_content_modified, get_content_versions, pastworks_last_modified
+from .mixins import ConditionalGetMixin
+from .models import About, Competency, PastWork
+
+
+class ContentApiView(ConditionalGetMixin, View):
+    """
+    Read-only JSON listing of ``model`` restricted to ``fields``.
+
+    The ETag and Last-Modified headers come from the model's content
+    version, so a conditional request that still matches is answered with a
+    304 before the rows are loaded or serialized.
+    """
+    http_method_names = ['get', 'head', 'options']
+    model = None
+    fields = ()
+    ordering = ('id',)
+
+    def get_etag(self, request, *args, **kwargs):
+        version, = get_content_versions(self.model)
+        return f'{self.model._meta.model_name}-{version}'
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return get_content_modified(self.model)
+
+    def get(self, request, *args, **kwargs):
+        rows = self.model.objects.order_by(*self.ordering).values(*self.fields)
+        response = JsonResponse({'results': list(rows)})
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+class AboutApiView(ContentApiView):
+    model = About
+    fields = ('id', 'paragraph')
+
+
+class CompetencyApiView(ContentApiView):
+    model = Competency
+    fields = ('id', 'skill')
+
+
+class PastWorkApiView(ContentApiView):
+    model = PastWork
+    fields = ('id', 'name', 'description', 'motivation', 'tools_used', 'github_link', 'page_link', 'date_modified')
+    ordering = ('-date_modified', '-id')
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return pastworks_last_modified()
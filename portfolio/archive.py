@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .cache import reason_lookup
+from .models import ArchivedMessage, Message
+
+
+def archive_cutoff(older_than_days=None):
+    if older_than_days is None:
+        older_than_days = settings.MESSAGE_RETENTION_DAYS
+    return timezone.now() - timedelta(days=older_than_days)
+
+
+def archive_batch(cutoff, batch_size):
+    """
+    Move up to ``batch_size`` of the oldest messages sent before ``cutoff`` into the archive.
+
+    The copy and the delete share a transaction, so a run that stops part
+    way loses nothing and the next one carries on from the oldest message
+    left. A message whose id is already archived fails the whole batch
+    rather than being deleted uncopied. Messages still waiting for their
+    notification digest stay in the inbox until it has gone out. Returns
+    how many messages were moved.
+    """
+    reasons = reason_lookup()
+    with transaction.atomic():
+        old = Message.objects.filter(date__lt=cutoff, notified=True).order_by('date', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            old = old.select_for_update(skip_locked=True)
+        batch = list(old[:batch_size])
+        ArchivedMessage.objects.bulk_create(
+            [ArchivedMessage(id=message.id, reason=reasons[message.reason_id].purpose, name=message.name,
+                             email=message.email, message=message.message, date=message.date)
+             for message in batch])
+        Message.objects.filter(id__in=[message.id for message in batch]).delete()
+    return len(batch)
+
+
+def archive_messages(older_than_days=None, batch_size=None, max_batches=None):
+    """Archive every message older than the retention period, a batch at a time. Returns how many moved."""
+    cutoff = archive_cutoff(older_than_days)
+    batch_size = batch_size or settings.MESSAGE_ARCHIVE_BATCH_SIZE
+    archived = batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = archive_batch(cutoff, batch_size)
+        archived += moved
+        batches += 1
+        if moved < batch_size:
+            break
+    return archived
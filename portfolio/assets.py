@@ -0,0 +1,62 @@
+import base64
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.contrib.staticfiles import finders
+
+# Third-party files base.html used to load from CDNs, pinned by their subresource integrity hashes.
+VENDOR_ASSETS = {
+    'bootstrap.css': {
+        'path': 'vendor/bootstrap-4.3.1.min.css',
+        'url': 'https://stackpath.bootstrapcdn.com/bootstrap/4.3.1/css/bootstrap.min.css',
+        'integrity': 'sha384-ggOyR0iXCbMQv3Xipma34MD+dH/1fQ784/j6cY/iJTQUOhcWr7x9JvoRxT2MZw1T',
+    },
+    'jquery.js': {
+        'path': 'vendor/jquery-3.3.1.slim.min.js',
+        'url': 'https://code.jquery.com/jquery-3.3.1.slim.min.js',
+        'integrity': 'sha384-q8i/X+965DzO0rT7abK41JStQIAqVgRVzpbzo5smXKp4YfRvH+8abtTE1Pi6jizo',
+    },
+    'popper.js': {
+        'path': 'vendor/popper-1.14.7.min.js',
+        'url': 'https://cdnjs.cloudflare.com/ajax/libs/popper.js/1.14.7/umd/popper.min.js',
+        'integrity': 'sha384-UO2eT0CpHqdSJQ6hJty5KVphtPhzWj9WO1clHTMGa3JDZwrnQq4sF86dIHNDz0W1',
+    },
+    'bootstrap.js': {
+        'path': 'vendor/bootstrap-4.3.1.min.js',
+        'url': 'https://stackpath.bootstrapcdn.com/bootstrap/4.3.1/js/bootstrap.min.js',
+        'integrity': 'sha384-JjSmVgyd0p3pXB1rRibZUAYoIIy6OrQ6VrjIEaFf/nJGzIxFDsf4x0xIM+B07jRM',
+    },
+}
+
+
+def integrity(content):
+    return 'sha384-' + base64.b64encode(hashlib.sha384(content).digest()).decode()
+
+
+def fetch_vendor_assets(directory, force=False):
+    """
+    Download every vendor asset missing from ``directory`` and check it against its pinned hash.
+
+    Returns the paths written. Raises ValueError, leaving nothing behind,
+    when a download does not match.
+    """
+    written = []
+    for asset in VENDOR_ASSETS.values():
+        target = Path(directory) / asset['path']
+        if target.exists() and not force:
+            continue
+        with urlopen(asset['url'], timeout=30) as response:
+            content = response.read()
+        if integrity(content) != asset['integrity']:
+            raise ValueError(f'{asset["url"]} does not match its pinned integrity hash')
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        written.append(asset['path'])
+    return written
+
+
+@lru_cache(maxsize=None)
+def is_vendored(path):
+    return finders.find(path) is not None
@@ -0,0 +1,38 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from . import views
+from .db import check_connections
+
+
+def read_only_view(view):
+    """
+    Wrap the sync ``view`` in an async view that runs it, rendering
+    included, in a single hop to the thread pool.
+
+    Under ASGI Django 3.1 runs every sync view on one shared thread, so
+    pages queue up behind each other. These views only read, so they can
+    run side by side (``thread_sensitive=False``). The pool threads hold
+    their own database connections, which the request_started and
+    request_finished signals never reach, so their housekeeping is done here.
+    """
+    def run(request, *args, **kwargs):
+        close_old_connections()
+        check_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    async def async_view(request, *args, **kwargs):
+        return await sync_to_async(run, thread_sensitive=False)(request, *args, **kwargs)
+
+    async_view.view_class = view.view_class
+    return async_view
+
+
+home = read_only_view(views.HomePageView.as_view())
+pastworks = read_only_view(views.PastWorksView.as_view())
+pastwork = read_only_view(views.PastWorkView.as_view())
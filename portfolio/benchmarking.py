@@ -0,0 +1,58 @@
+import math
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from .models import Message, PastWork
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(samples):
+    return {f'p{percent}_ms': round(percentile(samples, percent), 3) for percent in (50, 95, 99)}
+
+
+def create_pastworks(count, batch_size=1000):
+    return PastWork.objects.bulk_create(
+        (PastWork(name=f'Project {number}', description=f'Side project number {number}',
+                  motivation='Learning by building', tools_used='Django, Docker, Postgres',
+                  github_link=f'https://github.com/project-{number}', page_link=f'https://project-{number}.com')
+         for number in range(count)),
+        batch_size=batch_size)
+
+
+def create_messages(count, reasons, batch_size=1000, notified=True):
+    return Message.objects.bulk_create(
+        (Message(reason=reasons[number % len(reasons)], name=f'Sender {number}', email=f'sender{number}@doe.com',
+                 message=f'Message number {number}', notified=notified)
+         for number in range(count)),
+        batch_size=batch_size)
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Run a benchmark in a throwaway test database, so the rows it seeds never
+    reach the configured one. Under the test runner the connection already
+    points at a test database and is used as it is.
+    """
+    try:
+        setup_test_environment()
+        own_test_environment = True
+    except RuntimeError:
+        # Already running under the test runner.
+        own_test_environment = False
+    old_name = None
+    if own_test_environment:
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        if old_name is not None:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        if own_test_environment:
+            teardown_test_environment()
@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from .cache import bump_content_version
+from .models import Message, PastWork, Tool
+from .prerender import discard_prerendered_pages
+from .search import get_search_backend
+from .tools import sync_tools
+
+FORMATS = ('csv', 'json')
+
+PASTWORK_FIELDS = ('name', 'description', 'motivation', 'tools_used', 'github_link', 'page_link')
+# Column name and the field it is read from.
+EXPORT_COLUMNS = {
+    PastWork: [(field, field) for field in PASTWORK_FIELDS] + [('date_added', 'date_added'),
+                                                               ('date_modified', 'date_modified')],
+    Message: [('id', 'id'), ('reason', 'reason__purpose'), ('name', 'name'), ('email', 'email'),
+              ('message', 'message'), ('date', 'date')],
+}
+CONTENT_TYPES = {'csv': 'text/csv', 'json': 'application/json'}
+
+
+def format_from_name(filename, default='csv'):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return extension if extension in FORMATS else default
+
+
+def read_rows(stream, file_format):
+    """The rows of a CSV file with a header line, or of a JSON array of objects, as dicts."""
+    if file_format == 'csv':
+        return csv.DictReader(stream)
+    rows = json.load(stream)
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError('A JSON import must be an array of objects')
+    return rows
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _pastwork_from_row(row):
+    values = {}
+    for field in PASTWORK_FIELDS:
+        value = row.get(field)
+        value = value.strip() if isinstance(value, str) else value
+        if value in (None, ''):
+            value = None if PastWork._meta.get_field(field).null else ''
+        values[field] = value
+    pastwork = PastWork(**values)
+    pastwork.full_clean(validate_unique=False)
+    return pastwork
+
+
+def _validate_batch(numbered_rows, errors):
+    """The valid past works of a batch, with a row's errors recorded against its number instead."""
+    pastworks = {}
+    seen = {}
+    for number, row in numbered_rows:
+        try:
+            pastwork = _pastwork_from_row(row)
+        except ValidationError as error:
+            errors.append((number, '; '.join(f'{field}: {" ".join(messages)}'
+                                             for field, messages in error.message_dict.items())))
+            continue
+        clash = seen.get(('name', pastwork.name)) or seen.get(('github_link', pastwork.github_link))
+        if clash:
+            errors.append((number, f'repeats the name or GitHub link of row {clash}'))
+            continue
+        seen[('name', pastwork.name)] = seen[('github_link', pastwork.github_link)] = number
+        pastworks[number] = pastwork
+    return pastworks
+
+
+def _upsert_batch(pastworks, errors):
+    names = [pastwork.name for pastwork in pastworks.values()]
+    links = [pastwork.github_link for pastwork in pastworks.values()]
+    existing = PastWork.objects.filter(Q(name__in=names) | Q(github_link__in=links)).only('id', 'name', 'github_link')
+    by_name = {pastwork.name: pastwork.id for pastwork in existing}
+    by_link = {pastwork.github_link: pastwork.id for pastwork in existing}
+
+    new, changed = [], []
+    now = timezone.now()
+    for number, pastwork in pastworks.items():
+        matches = {by_name.get(pastwork.name), by_link.get(pastwork.github_link)} - {None}
+        if len(matches) > 1:
+            errors.append((number, 'its name and GitHub link belong to two different past works'))
+        elif matches:
+            pastwork.id = matches.pop()
+            pastwork.date_modified = now
+            changed.append(pastwork)
+        else:
+            pastwork.date_added = pastwork.date_modified = now
+            new.append(pastwork)
+
+    PastWork.objects.bulk_create(new)
+    PastWork.objects.bulk_update(changed, PASTWORK_FIELDS + ('date_modified',))
+    # bulk_create does not hand back ids on every database, so look them up again.
+    written = PastWork.objects.filter(name__in=[pastwork.name for pastwork in new + changed])
+    return list(written), len(new), len(changed)
+
+
+def import_pastworks(rows, batch_size=500):
+    """
+    Create or update a past work for each row, matching existing ones on
+    their unique ``name`` or ``github_link``.
+
+    Rows are validated and written ``batch_size`` at a time, each batch in
+    its own transaction. Invalid rows are skipped and returned in
+    ``errors`` as ``(row number, message)`` pairs. The bulk writes send no
+    signals, so the tools, search index, content versions and pre-rendered
+    pages are brought up to date here instead.
+    """
+    errors = []
+    created = updated = 0
+    for batch in _batches(enumerate(rows, start=1), batch_size):
+        pastworks = _validate_batch(batch, errors)
+        if not pastworks:
+            continue
+        with transaction.atomic():
+            written, batch_created, batch_updated = _upsert_batch(pastworks, errors)
+            sync_tools(written)
+            get_search_backend().index(written)
+        created += batch_created
+        updated += batch_updated
+
+    if created or updated:
+        bump_content_version(PastWork)
+        bump_content_version(Tool)
+        if settings.PRERENDER_ENABLED:
+            discard_prerendered_pages(PastWork)
+            discard_prerendered_pages(Tool)
+    return {'created': created, 'updated': updated, 'errors': sorted(errors)}
+
+
+class _Echo:
+    """A file-like object whose ``write`` hands back what it is given, for ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def export_chunks(queryset, file_format, chunk_size=2000):
+    """
+    Yield ``queryset``'s rows as CSV or as a JSON array, a line at a time.
+
+    Rows are read ``chunk_size`` at a time with ``iterator()``, so memory
+    stays flat however many there are.
+    """
+    columns = EXPORT_COLUMNS[queryset.model]
+    names = [name for name, _ in columns]
+    rows = queryset.order_by('pk').values_list(*(field for _, field in columns)).iterator(chunk_size=chunk_size)
+    if file_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(names)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+
+    yield '['
+    separator = '\n'
+    for row in rows:
+        yield separator + json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder)
+        separator = ',\n'
+    yield '\n]\n'
+
+
+def export_response(queryset, file_format, filename):
+    response = StreamingHttpResponse(export_chunks(queryset, file_format),
+                                     content_type=CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
+
+
+def uploaded_rows(uploaded_file, file_format):
+    """The rows of a file uploaded through a form, read as UTF-8 text."""
+    return read_rows(io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline=''), file_format)
@@ -0,0 +1,94 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models import Max
+from django.middleware.csrf import get_token
+from django.utils import timezone
+from .models import PastWork, Reason
+from .spam import form_timestamp
+
+CSRF_TOKEN_PLACEHOLDER = 'portfolio-csrf-token-placeholder'
+FORM_RENDERED_AT_PLACEHOLDER = 'portfolio-form-rendered-at-placeholder'
+
+_reason_table = {'version': None, 'reasons': {}}
+
+
+def _version_key(model):
+    return f'portfolio:version:{model._meta.label_lower}'
+
+
+def _modified_key(model):
+    return f'portfolio:modified:{model._meta.label_lower}'
+
+
+def _initial_version():
+    # Seeded from the clock so that a version key which was evicted never
+    # restarts at a number some older cached page was stored under.
+    return int(time.time() * 1000)
+
+
+def get_content_versions(*models):
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def bump_content_version(model):
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), None)
+    cache.set(_modified_key(model), timezone.now(), None)
+
+
+def get_content_modified(*models):
+    """When any of ``models`` last changed, as far as this cache has seen."""
+    keys = [_modified_key(model) for model in models]
+    stamps = cache.get_many(keys)
+    for key in keys:
+        if key not in stamps:
+            cache.add(key, timezone.now(), None)
+            stamps[key] = cache.get(key)
+    return max(stamps.values())
+
+
+def pastworks_last_modified():
+    # date_modified does not move when a past work is deleted, so fall back
+    # on the content version's timestamp when that is newer.
+    latest = PastWork.objects.aggregate(latest=Max('date_modified'))['latest']
+    changed = get_content_modified(PastWork)
+    return max(latest, changed) if latest else changed
+
+
+def fill_placeholders(content, request):
+    """Put the visitor's CSRF token and a fresh form timestamp into a page rendered with placeholders."""
+    content = content.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request))
+    if FORM_RENDERED_AT_PLACEHOLDER in content:
+        content = content.replace(FORM_RENDERED_AT_PLACEHOLDER, form_timestamp())
+    return content
+
+
+def page_cache_key(path, versions):
+    path_hash = hashlib.md5(path.encode()).hexdigest()
+    version = '.'.join(str(v) for v in versions)
+    return f'portfolio:page:{version}:{path_hash}'
+
+
+def reason_lookup():
+    """
+    Every Reason by id, held in process memory.
+
+    The table is reloaded whenever the Reason content version moves on, so
+    an edit made in any worker reaches the others on their next lookup.
+    """
+    version = get_content_versions(Reason)
+    if _reason_table['version'] != version:
+        _reason_table['reasons'] = {reason.id: reason for reason in Reason.objects.all()}
+        _reason_table['version'] = version
+    return _reason_table['reasons']
@@ -0,0 +1,194 @@
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from .storage import minify_css
+
+CRITICAL_CSS_PATH = 'css/critical.css'
+
+SELECTOR_NOISE = re.compile(r'::?[\w-]+(\([^)]*\))?|\[[^\]]*\]')
+COMBINATORS = re.compile(r'\s*[\s>+~]\s*')
+COMPOUND = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>.*)$')
+
+
+class _UsedSelectors(HTMLParser):
+
+    def __init__(self):
+        super().__init__()
+        self.tags, self.classes, self.ids = set(), set(), set()
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        for name, value in attrs:
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+
+
+def used_selectors(*documents):
+    """The tags, classes and ids that appear in any of the HTML ``documents``."""
+    parser = _UsedSelectors()
+    for document in documents:
+        parser.feed(document)
+    return parser
+
+
+def _split_top_level(text, separator):
+    parts, depth, start = [], 0, 0
+    for position, character in enumerate(text):
+        if character in '([':
+            depth += 1
+        elif character in ')]':
+            depth -= 1
+        elif character == separator and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return parts
+
+
+def selector_matches(selector, used):
+    """
+    Whether every compound in ``selector`` could match an element of the documents.
+
+    Pseudo-classes and attribute tests are ignored and so are the relations
+    between compounds, which errs on the side of keeping a rule.
+    """
+    selector = SELECTOR_NOISE.sub('', selector).strip()
+    for compound in COMBINATORS.split(selector):
+        if not compound:
+            continue
+        parts = COMPOUND.match(compound)
+        tag = parts.group('tag')
+        if tag and tag != '*' and tag.lower() not in used.tags:
+            return False
+        rest = parts.group('rest')
+        if not set(re.findall(r'\.([\w-]+)', rest)) <= used.classes:
+            return False
+        if not set(re.findall(r'#([\w-]+)', rest)) <= used.ids:
+            return False
+    return True
+
+
+def _blocks(css):
+    """Yield ``(prelude, body)`` for each top-level rule or at-rule of ``css``."""
+    position = 0
+    while True:
+        opening = css.find('{', position)
+        if opening == -1:
+            return
+        prelude = css[position:opening]
+        # Statements such as @charset or @import end before the block does.
+        statement_end = prelude.rfind(';')
+        if statement_end != -1:
+            prelude = prelude[statement_end + 1:]
+        depth = 1
+        cursor = opening + 1
+        while depth and cursor < len(css):
+            if css[cursor] == '{':
+                depth += 1
+            elif css[cursor] == '}':
+                depth -= 1
+            cursor += 1
+        yield prelude.strip(), css[opening + 1:cursor - 1]
+        position = cursor
+
+
+def critical_rules(css, used):
+    """The rules of ``css`` that apply to the documents ``used`` was built from."""
+    kept = []
+    for prelude, body in _blocks(minify_css(css)):
+        if prelude.startswith('@media print'):
+            continue
+        elif prelude.startswith(('@media', '@supports')):
+            inner = critical_rules(body, used)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            # Fonts and animations are not needed for the first paint.
+            continue
+        elif any(selector_matches(selector, used) for selector in _split_top_level(prelude, ',')):
+            kept.append(f'{prelude}{{{body}}}')
+    return ''.join(kept)
+
+
+@lru_cache(maxsize=None)
+def critical_css():
+    """The stylesheet written by ``manage.py build_critical_css``, or '' before it has run."""
+    found = finders.find(CRITICAL_CSS_PATH)
+    return Path(found).read_text() if found else ''
+
+
+class _RenderBlocking(HTMLParser):
+
+    def __init__(self):
+        super().__init__()
+        self.in_head = False
+        self.in_style = False
+        self.in_noscript = False
+        self.stylesheets, self.scripts, self.inline_css = [], [], 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'noscript':
+            # Only read by browsers without JavaScript, which wait for everything anyway.
+            self.in_noscript = True
+        elif self.in_noscript:
+            return
+        elif tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        elif (tag == 'link' and self.in_head and 'stylesheet' in (attrs.get('rel') or '').split()
+              and attrs.get('media', 'all') in ('all', 'screen')):
+            self.stylesheets.append(attrs.get('href'))
+        elif tag == 'style' and self.in_head:
+            self.in_style = True
+        elif (tag == 'script' and attrs.get('src') and 'defer' not in attrs and 'async' not in attrs
+              and attrs.get('type') != 'module'):
+            self.scripts.append(attrs['src'])
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.in_head = False
+        elif tag == 'noscript':
+            self.in_noscript = False
+        elif tag == 'style':
+            self.in_style = False
+
+    def handle_data(self, data):
+        if self.in_style:
+            self.inline_css += len(data.encode())
+
+
+def _static_size(url):
+    if not url.startswith(settings.STATIC_URL):
+        return None
+    path = url[len(settings.STATIC_URL):]
+    found = finders.find(path) or Path(settings.STATIC_ROOT) / path
+    return Path(found).stat().st_size if Path(found).exists() else None
+
+
+def render_blocking(html):
+    """
+    What the browser has to fetch and parse before it can first paint ``html``.
+
+    Stylesheets in the head and scripts without ``defer`` or ``async`` block
+    rendering; ``blocking_bytes`` adds up the local ones and the CSS inlined
+    into the head. Files on other hosts are listed in ``external`` since
+    their size is not known here.
+    """
+    parser = _RenderBlocking()
+    parser.feed(html)
+    resources = parser.stylesheets + parser.scripts
+    sizes = {url: _static_size(url) for url in resources}
+    return {
+        'blocking_requests': len(resources),
+        'blocking_bytes': parser.inline_css + sum(size for size in sizes.values() if size),
+        'inline_css_bytes': parser.inline_css,
+        'external': sorted(url for url, size in sizes.items() if size is None),
+    }
@@ -0,0 +1,102 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import suppress
+
+from django.conf import settings
+from django.db import DatabaseError, Error, connections
+
+logger = logging.getLogger('portfolio.db')
+
+POOL_STATS = ('opened', 'reused', 'checked', 'stale')
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def pool_stats():
+    """This process's persistent connection figures since it started."""
+    with _stats_lock:
+        return {name: _stats[name] for name in POOL_STATS}
+
+
+def connection_is_usable(connection):
+    # Through Django's cursor, so the probe shows up in query counts and request metrics like any query.
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Error:
+        return False
+    return True
+
+
+def check_connection(connection):
+    """Close ``connection`` if it no longer answers, so Django opens a fresh one on its next query."""
+    _count('checked')
+    if connection_is_usable(connection):
+        connection.health_checked_at = time.monotonic()
+        return True
+
+    _count('stale')
+    logger.warning(json.dumps({'event': 'stale_connection', 'alias': connection.alias, **pool_stats()}))
+    # Closing a broken connection can fail too; Django forgets it either way.
+    with suppress(DatabaseError):
+        connection.close()
+    return False
+
+
+def _check_before_first_use(connection):
+    ensure_connection = connection.ensure_connection
+
+    def checked_ensure_connection():
+        if connection.health_check_pending:
+            connection.health_check_pending = False
+            if connection.connection is not None and not connection.in_atomic_block:
+                check_connection(connection)
+        ensure_connection()
+
+    connection.ensure_connection = checked_ensure_connection
+    connection.health_check_pending = False
+
+
+def check_connections(handler=connections, interval=None):
+    """
+    Have every persistent connection in ``handler`` checked before its next query.
+
+    The check waits until the request first uses the connection, so a
+    request that never touches the database (static files, cached and
+    prerendered pages, 304s) costs nothing. A connection that no longer
+    answers is closed and Django opens a fresh one, instead of failing on a
+    connection the database dropped (a restart, a failover, an idle
+    timeout). A connection that passed a check less than ``interval``
+    seconds ago (``DB_HEALTH_CHECK_INTERVAL``) is not checked again.
+    Connections that are not kept between requests are always fresh.
+    """
+    if interval is None:
+        interval = settings.DB_HEALTH_CHECK_INTERVAL
+    now = time.monotonic()
+    for connection in handler.all():
+        if connection.connection is None or not connection.settings_dict['CONN_MAX_AGE']:
+            continue
+        _count('reused')
+        if now - getattr(connection, 'health_checked_at', float('-inf')) < interval:
+            continue
+        if not hasattr(connection, 'health_check_pending'):
+            _check_before_first_use(connection)
+        connection.health_check_pending = True
+
+
+def check_database_connections(sender, **kwargs):
+    check_connections()
+
+
+def count_new_connection(sender, connection, **kwargs):
+    connection.health_checked_at = time.monotonic()
+    _count('opened')
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Message
+from .outbox import queue_email
+
+DIGEST = 'digest'
+
+
+def digest_enabled():
+    return settings.MESSAGE_NOTIFICATIONS == DIGEST
+
+
+def digest_subject(count):
+    return f'{count} new message{"" if count == 1 else "s"} from Portfolio App'
+
+
+def digest_body(messages):
+    """One section per reason, each listing its messages oldest first."""
+    sections = []
+    ordered = sorted(messages, key=lambda message: (message.reason.purpose, message.date, message.id))
+    for purpose, group in groupby(ordered, key=lambda message: message.reason.purpose):
+        group = list(group)
+        lines = [f'{purpose} ({len(group)})', '-' * len(f'{purpose} ({len(group)})')]
+        for message in group:
+            lines.append(f'{message.name} <{message.email}> on {message.date:%Y-%m-%d %H:%M}:\n"{message.message}"\n')
+        sections.append('\n'.join(lines))
+    return '\n\n'.join(sections)
+
+
+def digest_due(batch, force, now):
+    full = min(settings.MESSAGE_DIGEST_SIZE, settings.MESSAGE_DIGEST_MAX_MESSAGES)
+    return bool(batch) and (force or len(batch) >= full
+                            or batch[0].date <= now - timedelta(minutes=settings.MESSAGE_DIGEST_MINUTES))
+
+
+def claim_messages(batch):
+    """
+    Mark ``batch`` as notified and return the messages this call marked.
+
+    With SKIP LOCKED the rows read are already locked to this run, so one
+    update claims them all. Without it (SQLite) another run may have read
+    and claimed some of them first, so each row is claimed by its own
+    conditional update and the ones already taken are dropped.
+    """
+    if connection.features.has_select_for_update_skip_locked:
+        Message.objects.filter(id__in=[message.id for message in batch]).update(notified=True)
+        return batch
+    return [message for message in batch
+            if Message.objects.filter(id=message.id, notified=False).update(notified=True)]
+
+
+def queue_digest(force=False, now=None):
+    """
+    Queue one digest email covering up to ``MESSAGE_DIGEST_MAX_MESSAGES`` unsent messages.
+
+    A digest is due once ``MESSAGE_DIGEST_SIZE`` messages (or a full digest)
+    are waiting or the oldest has waited ``MESSAGE_DIGEST_MINUTES``;
+    ``force`` sends whatever is waiting. The messages are claimed in the
+    transaction that queues the email and the digest only covers the ones
+    this run claimed, so each message goes out in exactly one digest even
+    when runs overlap. Returns the queued OutboxEmail, or None when no
+    digest is due.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        waiting = Message.objects.filter(notified=False).select_related('reason').order_by('date', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            waiting = waiting.select_for_update(skip_locked=True, of=('self',))
+        batch = list(waiting[:settings.MESSAGE_DIGEST_MAX_MESSAGES])
+        if not digest_due(batch, force, now):
+            return None
+        batch = claim_messages(batch)
+        if not batch:
+            return None
+        return queue_email(digest_subject(len(batch)), digest_body(batch), [f'{settings.EMAIL_RECEIVER}'])
+
+
+def queue_digests(force=False):
+    """Queue digests until no more are due. Returns how many were queued."""
+    queued = 0
+    while queue_digest(force):
+        queued += 1
+    return queued
@@ -0,0 +1,36 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from .cache import reason_lookup
+from .models import Message, Reason
+
+
+class ReasonChoiceField(forms.ModelChoiceField):
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            reason = reason_lookup().get(int(value))
+        except (TypeError, ValueError):
+            reason = None
+        if reason is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return reason
+
+
+class MessageForm(forms.ModelForm):
+    reason = ReasonChoiceField(queryset=Reason.objects.all())
+
+    class Meta:
+        model = Message
+        fields = ['reason', 'name', 'email', 'message']
+
+    def _get_validation_exclusions(self):
+        # The reason was already checked against the lookup table, so skip the
+        # model's own foreign key validation and the query it would run.
+        return [*super()._get_validation_exclusions(), 'reason']
+
+
+class ImportForm(forms.Form):
+    file = forms.FileField()
+    format = forms.ChoiceField(choices=[('', 'From the file name'), ('csv', 'CSV'), ('json', 'JSON')],
+                               required=False)
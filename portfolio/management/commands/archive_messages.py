@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from ...archive import archive_messages
+
+
+class Command(BaseCommand):
+    help = ('Move received messages older than MESSAGE_RETENTION_DAYS out of the inbox into the archive, '
+            'in batches; an interrupted run can simply be started again')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int,
+                            help='Archive messages older than this instead of MESSAGE_RETENTION_DAYS')
+        parser.add_argument('--batch-size', type=int,
+                            help='Messages moved per transaction instead of MESSAGE_ARCHIVE_BATCH_SIZE')
+        parser.add_argument('--max-batches', type=int,
+                            help='Stop after this many batches and leave the rest for the next run')
+
+    def handle(self, *args, **options):
+        archived = archive_messages(options['older_than_days'], options['batch_size'], options['max_batches'])
+        self.stdout.write(f'Archived {archived} message(s)')
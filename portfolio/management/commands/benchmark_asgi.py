@@ -0,0 +1,171 @@
+import asyncio
+import itertools
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import reverse
+from ...benchmarking import benchmark_database, create_pastworks, latency_summary
+from ...models import About, Competency, PastWork, Reason
+
+
+class Command(BaseCommand):
+    help = ('Compare the throughput of the WSGI and ASGI paths under many concurrent, slow clients. '
+            'Requests are fed to both applications in-process; --workers sync workers serve the WSGI '
+            'path, one event loop the ASGI one, and each client spends --client-delay seconds reading '
+            'its response, which holds a sync worker but not the event loop.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pastworks', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='Clients sending requests at the same time')
+        parser.add_argument('--requests', type=int, default=500,
+                            help='Requests sent through each path')
+        parser.add_argument('--workers', type=int, default=3,
+                            help='Sync workers serving the WSGI path')
+        parser.add_argument('--client-delay', type=float, default=0.05,
+                            help='Seconds each client takes to read a response')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.seed(options)
+            paths = self.paths()
+            report = {
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'workers': options['workers'],
+                'client_delay': options['client_delay'],
+                'paths': paths,
+            }
+            with override_settings(ROOT_URLCONF='portfolio_project.urls'):
+                cache.clear()
+                report['wsgi'] = self.run_wsgi(paths, options)
+            with override_settings(ROOT_URLCONF='portfolio_project.asgi_urls'):
+                cache.clear()
+                report['asgi'] = asyncio.run(self.run_asgi(paths, options))
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
+
+    def seed(self, options):
+        Reason.objects.create(purpose='Hiring')
+        About.objects.create(paragraph='I am a backend developer')
+        Competency.objects.create(skill='Development and Source Control (Docker, Git, Github)')
+        create_pastworks(max(options['pastworks'], 1))
+
+    def paths(self):
+        pk = PastWork.objects.values_list('pk', flat=True).first()
+        return [reverse('home'), reverse('pastworks'), reverse('pastwork', kwargs={'pk': pk})]
+
+    @staticmethod
+    def summary(latencies, statuses, elapsed):
+        return {
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            **latency_summary(latencies),
+            'errors': sum(status != 200 for status in statuses),
+        }
+
+    def run_wsgi(self, paths, options):
+        application = WSGIHandler()
+        workers = threading.BoundedSemaphore(options['workers'])
+        queue = itertools.islice(itertools.cycle(paths), options['requests'])
+        queue_lock = threading.Lock()
+        latencies, statuses = [], []
+
+        def client():
+            while True:
+                with queue_lock:
+                    path = next(queue, None)
+                if path is None:
+                    return
+                start = time.perf_counter()
+                with workers:
+                    status = []
+                    body = application(self.wsgi_environ(path), lambda line, headers, exc_info=None: status.append(line))
+                    b''.join(body)
+                    time.sleep(options['client_delay'])
+                    body.close()
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses.append(int(status[0].split()[0]))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as clients:
+            for _ in range(options['concurrency']):
+                clients.submit(client)
+        return self.summary(latencies, statuses, time.perf_counter() - start)
+
+    async def run_asgi(self, paths, options):
+        application = ASGIHandler()
+        queue = itertools.islice(itertools.cycle(paths), options['requests'])
+        latencies, statuses = [], []
+
+        async def client():
+            for path in queue:
+                start = time.perf_counter()
+                statuses.append(await self.asgi_request(application, path, options['client_delay']))
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(options['concurrency'])))
+        return self.summary(latencies, statuses, time.perf_counter() - start)
+
+    @staticmethod
+    def wsgi_environ(path):
+        return {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'testserver',
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.input': None,
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': None,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+    @staticmethod
+    async def asgi_request(application, path, client_delay):
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': b'',
+            'root_path': '',
+            'headers': [(b'host', b'testserver')],
+            'client': ('127.0.0.1', 0),
+            'server': ('testserver', 80),
+        }
+        status = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif not message.get('more_body'):
+                await asyncio.sleep(client_delay)
+
+        await application(scope, receive, send)
+        return status[0]
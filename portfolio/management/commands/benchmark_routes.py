@@ -0,0 +1,141 @@
+import json
+import logging
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from ... import urls
+from ...benchmarking import benchmark_database, create_messages, create_pastworks, latency_summary
+from ...models import About, Competency, PastWork, Reason
+from ...search import get_search_backend
+from ...tools import sync_tools
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway database and report latency, query counts and memory for every named portfolio route'
+
+    # Extra query string parameters for routes that need them to do real work.
+    route_params = {
+        'pastwork_search': {'q': 'project docker'},
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pastworks', type=int, default=10000)
+        parser.add_argument('--messages', type=int, default=100000)
+        parser.add_argument('--reasons', type=int, default=5)
+        parser.add_argument('--iterations', type=int, default=50,
+                            help='Timed requests per route')
+        parser.add_argument('--routes', nargs='*', metavar='NAME',
+                            help='Only benchmark these route names')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Clear the cache before every request')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.seed(options)
+            report = {
+                'database': connection.vendor,
+                'volumes': {key: options[key] for key in ('pastworks', 'messages', 'reasons')},
+                'iterations': options['iterations'],
+                'cold_cache': options['cold_cache'],
+                'routes': self.run(options),
+            }
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
+
+    def seed(self, options):
+        Reason.objects.bulk_create(Reason(purpose=f'Reason {number}') for number in range(max(options['reasons'], 1)))
+        reasons = list(Reason.objects.all())
+        About.objects.create(paragraph='I am a backend developer')
+        Competency.objects.create(skill='Development and Source Control (Docker, Git, Github)')
+        create_pastworks(options['pastworks'])
+        create_messages(options['messages'], reasons)
+        # Bulk inserts skip the signals that keep the search index and tools current.
+        get_search_backend().rebuild()
+        sync_tools(PastWork.objects.only('id', 'tools_used'))
+        cache.clear()
+
+    def named_routes(self, options):
+        patterns = [pattern for pattern in urls.urlpatterns if isinstance(pattern, URLPattern) and pattern.name]
+        selected = set(options['routes'] or [])
+        unknown = selected - {pattern.name for pattern in patterns}
+        if unknown:
+            raise CommandError(f'Unknown routes: {", ".join(sorted(unknown))}')
+        return [pattern for pattern in patterns if not selected or pattern.name in selected]
+
+    def route_kwargs(self, pattern):
+        if 'pk' not in pattern.pattern.converters:
+            return {}
+        model = pattern.callback.view_class.model
+        return {'pk': model.objects.values_list('pk', flat=True).first()}
+
+    def run(self, options):
+        anonymous = Client()
+        superuser = Client()
+        superuser.force_login(get_user_model().objects.create_superuser(
+            username='benchmark', email='benchmark@example.com', password='benchmark'))
+
+        # Failing routes are reported in the JSON, so keep their tracebacks off stderr.
+        request_logger = logging.getLogger('django.request')
+        request_logger.disabled = True
+        results = {}
+        try:
+            for pattern in self.named_routes(options):
+                view_class = getattr(pattern.callback, 'view_class', None)
+                client = superuser if view_class and issubclass(view_class, LoginRequiredMixin) else anonymous
+                url = reverse(pattern.name, kwargs=self.route_kwargs(pattern))
+                params = self.route_params.get(pattern.name, {})
+                results[pattern.name] = self.measure(client, url, params, options)
+        finally:
+            request_logger.disabled = False
+        return results
+
+    def measure(self, client, url, params, options):
+        latencies = []
+        queries = []
+        try:
+            for _ in range(options['iterations']):
+                if options['cold_cache']:
+                    cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    # secure=True so the prod profile's SSL redirect doesn't answer in place of the page.
+                    response = client.get(url, params, secure=True)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                if not 200 <= response.status_code < 300:
+                    # Timing a redirect or an error page says nothing about the route.
+                    return {'url': url, 'status': response.status_code,
+                            'error': f'HTTP {response.status_code} {response.reason_phrase}'}
+                queries.append(len(captured))
+
+            if options['cold_cache']:
+                cache.clear()
+            tracemalloc.start()
+            client.get(url, params, secure=True)
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        except Exception as error:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            return {'url': url, 'error': f'{type(error).__name__}: {error}'}
+
+        return {
+            'url': url,
+            'status': response.status_code,
+            **latency_summary(latencies),
+            'queries': max(queries),
+            'peak_memory_kb': round(peak_memory / 1024, 1),
+        }
@@ -0,0 +1,46 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from ...benchmarking import benchmark_database, create_pastworks, latency_summary
+from ...search import ScanSearchBackend, get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Compare the full-text search index against a plain table scan on a seeded database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pastworks', type=int, default=50000)
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--queries', nargs='*', default=['project 4821', 'docker', 'learning building', 'nothing'])
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            create_pastworks(options['pastworks'])
+            indexed = get_search_backend()
+            start = time.perf_counter()
+            indexed.rebuild()
+            index_build_ms = (time.perf_counter() - start) * 1000
+
+            backends = {type(indexed).__name__: indexed, ScanSearchBackend.__name__: ScanSearchBackend()}
+            report = {
+                'database': connection.vendor,
+                'pastworks': options['pastworks'],
+                'iterations': options['iterations'],
+                'index_build_ms': round(index_build_ms, 3),
+                'backends': {name: self.measure(backend, options) for name, backend in backends.items()},
+            }
+        self.stdout.write(json.dumps(report, indent=2, sort_keys=True))
+
+    def measure(self, backend, options):
+        results = {}
+        for query in options['queries']:
+            latencies = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                page = backend.search(query, options['page_size'])
+                latencies.append((time.perf_counter() - start) * 1000)
+            results[query] = {**latency_summary(latencies), 'results': len(page)}
+        return results
@@ -0,0 +1,75 @@
+import json
+import random
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ...benchmarking import latency_summary
+from ...spam import HONEYPOT_FIELD, RENDERED_AT_FIELD, RecentMessageIndex, form_timestamp, score_submission
+
+WORDS = [f'word{number}' for number in range(5000)]
+
+
+class Command(BaseCommand):
+    help = 'Measure the throughput of the contact form spam scoring on a synthetic mix of submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--submissions', type=int, default=10000)
+        parser.add_argument('--spam-ratio', type=float, default=0.3,
+                            help='Share of submissions built to trip the heuristics')
+        parser.add_argument('--duplicate-ratio', type=float, default=0.2,
+                            help='Share of submissions that resend a recent message with a word changed')
+        parser.add_argument('--cache', default=settings.SPAM_CACHE, help='Cache alias holding the duplicate index')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        index = RecentMessageIndex(options['cache'], key=f'portfolio:spam-benchmark:{time.time_ns()}')
+        # Scored as if sent a minute after the form was rendered.
+        now = time.time() + 60
+        timestamp = form_timestamp()
+
+        sent, latencies, verdicts = [], [], Counter()
+        start = time.perf_counter()
+        for number in range(options['submissions']):
+            kind, data = self.submission(rng, number, sent, timestamp, options)
+            began = time.perf_counter()
+            verdict = score_submission(data, index, now)
+            if verdict.accepted:
+                index.add(verdict.fingerprint, data['email'], now)
+                sent.append(data['message'])
+            latencies.append((time.perf_counter() - began) * 1000)
+            outcome = 'spam' if verdict.spam else 'duplicate' if verdict.duplicate else 'accepted'
+            verdicts[f'{kind}:{outcome}'] += 1
+        elapsed = time.perf_counter() - start
+
+        report = {
+            'submissions': options['submissions'],
+            'cache': options['cache'],
+            'submissions_per_second': round(options['submissions'] / elapsed, 1),
+            **latency_summary(latencies),
+            'verdicts': dict(sorted(verdicts.items())),
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
+
+    def submission(self, rng, number, sent, timestamp, options):
+        data = {'name': f'Sender {number}', 'email': f'sender{number}@doe.com', RENDERED_AT_FIELD: timestamp}
+        roll = rng.random()
+        if roll < options['spam_ratio']:
+            data[HONEYPOT_FIELD] = 'https://example.com'
+            data['message'] = ' '.join(f'https://spam.example/{rng.randrange(10 ** 6)}' for _ in range(4))
+            return 'spam', data
+        if sent and roll < options['spam_ratio'] + options['duplicate_ratio']:
+            words = rng.choice(sent[-settings.SPAM_DUPLICATE_HISTORY:]).split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            data['message'] = ' '.join(words)
+            return 'duplicate', data
+        data['message'] = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 60)))
+        return 'ham', data
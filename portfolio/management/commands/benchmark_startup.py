@@ -0,0 +1,102 @@
+import copy
+import json
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from ...benchmarking import benchmark_database, create_pastworks, latency_summary
+from ...models import About, Competency, Reason
+from ...startup import warm_templates
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+class Command(BaseCommand):
+    help = ('Measure the first request served by fresh processes with the plain template loaders, '
+            'the cached loader, and the cached loader warmed at boot')
+
+    modes = ('uncached', 'cached', 'warmed')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5,
+                            help='Fresh processes started per mode')
+        parser.add_argument('--url', default='/',
+                            help='Path requested by each process')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--probe', choices=self.modes,
+                            help='Internal: time one process in this mode and print its figures')
+
+    def handle(self, *args, **options):
+        if options['probe']:
+            self.stdout.write(json.dumps(self.probe(options['probe'], options['url'])))
+            return
+
+        report = {'url': options['url'], 'runs': options['runs'], 'modes': {}}
+        for mode in self.modes:
+            probes = [self.spawn(mode, options['url']) for _ in range(options['runs'])]
+            report['modes'][mode] = {
+                key: latency_summary([probe[key] for probe in probes])
+                for key in ('warm_ms', 'first_request_ms', 'next_request_ms')
+            }
+            report['modes'][mode]['status'] = sorted({probe['status'] for probe in probes})
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
+
+    def spawn(self, mode, url):
+        completed = subprocess.run(
+            [sys.executable, '-m', 'django', 'benchmark_startup', '--probe', mode, '--url', url],
+            cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(f'The {mode} probe failed:\n{completed.stderr.strip()}')
+        return json.loads(completed.stdout)
+
+    def probe(self, mode, url):
+        templates = copy.deepcopy(settings.TEMPLATES)
+        templates[0]['APP_DIRS'] = False
+        templates[0]['OPTIONS']['loaders'] = (
+            TEMPLATE_LOADERS if mode == 'uncached' else [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)])
+
+        with override_settings(TEMPLATES=templates), benchmark_database():
+            Reason.objects.create(purpose='Hiring')
+            About.objects.create(paragraph='I am a backend developer')
+            Competency.objects.create(skill='Development and Source Control (Docker, Git, Github)')
+            create_pastworks(10)
+
+            start = time.perf_counter()
+            if mode == 'warmed':
+                warm_templates()
+            warm = time.perf_counter() - start
+
+            client = Client()
+            start = time.perf_counter()
+            # secure=True so the prod profile's SSL redirect doesn't answer in place of the page.
+            response = client.get(url, secure=True)
+            first = time.perf_counter() - start
+            self.check_status(response, url)
+
+            # Keep the page cache from answering the second request.
+            cache.clear()
+            start = time.perf_counter()
+            response = client.get(url, secure=True)
+            after = time.perf_counter() - start
+            self.check_status(response, url)
+
+        return {'warm_ms': warm * 1000, 'first_request_ms': first * 1000, 'next_request_ms': after * 1000,
+                'status': response.status_code}
+
+    def check_status(self, response, url):
+        if response.status_code != 200:
+            raise CommandError(f'{url} answered {response.status_code}, not 200, so there is no page to time')
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from ...assets import VENDOR_ASSETS
+from ...critical import CRITICAL_CSS_PATH, critical_rules, used_selectors
+from ...models import About, Competency, PastWork, Reason
+from ...pagination import KeysetPage
+
+
+class Command(BaseCommand):
+    help = ('Write the styles the home page needs for its first paint to static/css/critical.css, '
+            'which base.html inlines so the full stylesheets can load without blocking rendering')
+
+    stylesheets = ('css/styles.css', VENDOR_ASSETS['bootstrap.css']['path'])
+
+    def handle(self, *args, **options):
+        sources = []
+        for path in self.stylesheets:
+            found = finders.find(path)
+            if not found:
+                raise CommandError(f'{path} was not found; run "manage.py vendor_assets" first')
+            sources.append(Path(found).read_text())
+
+        used = used_selectors(*self.render_home_pages())
+        css = ''.join(critical_rules(source, used) for source in sources)
+        destination = Path(settings.STATICFILES_DIRS[0]) / CRITICAL_CSS_PATH
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_text(css)
+        self.stdout.write(f'Wrote {len(css.encode())} bytes of critical CSS to {destination}')
+
+    def render_home_pages(self):
+        """
+        home.html as visitors and the site owner see it, with a message shown
+        and a full page of past works, rendered without touching the database
+        so the command can run at build time.
+        """
+        pastworks = [PastWork(id=number, name='Project', description='A side project',
+                              github_link='https://github.com/', page_link='https://example.com/')
+                     for number in (1, 2)]
+        context = {
+            'abouts': [About(id=1, paragraph='About me')],
+            'competencies': [Competency(id=1, skill='Skill')],
+            'reasons': [Reason(id=1, purpose='Hiring')],
+            'pastworks': KeysetPage(pastworks, True, False, 'cursor', None),
+            'messages': ['Message sent'],
+            # A version no real fragment has, and a timeout that keeps nothing.
+            'fragment_versions': {'pastwork': 'critical', 'reason': 'critical'},
+            'fragment_cache_seconds': 0,
+        }
+        for user in (AnonymousUser(), get_user_model()(id=1, username='owner', is_superuser=True)):
+            request = RequestFactory().get('/')
+            request.user = user
+            yield render_to_string('home.html', context, request)
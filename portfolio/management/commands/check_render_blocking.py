@@ -0,0 +1,67 @@
+import json
+
+from django.core.management.base import CommandError
+from django.db import connection
+from ...benchmarking import benchmark_database
+from ...critical import render_blocking
+from .benchmark_routes import Command as BenchmarkRoutesCommand
+
+
+class Command(BenchmarkRoutesCommand):
+    help = ('Seed a throwaway database, request every named portfolio route once and report, for each '
+            'page template, the stylesheets, scripts and inline CSS that block its first render')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pastworks', type=int, default=20)
+        parser.add_argument('--messages', type=int, default=20)
+        parser.add_argument('--reasons', type=int, default=2)
+        parser.add_argument('--routes', nargs='*', metavar='NAME',
+                            help='Only check these route names')
+        parser.add_argument('--budget', type=int, metavar='BYTES',
+                            help='Fail when any page blocks its first render on more than this many bytes')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            self.seed(options)
+            pages = {}
+            unchecked = []
+            for route, result in self.run(options).items():
+                template = result.pop('template', None)
+                if template:
+                    pages.setdefault(template, {**result, 'routes': []})['routes'].append(route)
+                else:
+                    unchecked.append(route)
+            report = {'database': connection.vendor, 'templates': pages}
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                report_file.write(output)
+        else:
+            self.stdout.write(output)
+
+        if not pages:
+            raise CommandError('No page template was checked')
+        # Routes picked by name must each give a page; the full run skips redirects and APIs.
+        if options['routes'] and unchecked:
+            raise CommandError(f'No page to check for: {", ".join(sorted(unchecked))}')
+        over_budget = sorted(template for template, page in pages.items()
+                             if options['budget'] is not None and page['blocking_bytes'] > options['budget'])
+        if over_budget:
+            raise CommandError(f'Over the {options["budget"]} byte budget: {", ".join(over_budget)}')
+
+    def measure(self, client, url, params, options):
+        try:
+            # secure=True so the prod profile's SSL redirect doesn't answer in place of the page.
+            response = client.get(url, params, secure=True)
+        except Exception as error:
+            return {'url': url, 'error': f'{type(error).__name__}: {error}'}
+        if response.status_code != 200 or not response.templates:
+            # Redirects and errors have no page of their own to check.
+            return {'url': url, 'status': response.status_code}
+        return {
+            'url': url,
+            'template': response.templates[0].name,
+            **render_blocking(response.content.decode()),
+        }
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from ...bulk import FORMATS, export_chunks, format_from_name
+from ...models import Message, PastWork
+
+MODELS = {'pastworks': PastWork, 'messages': Message}
+
+
+class Command(BaseCommand):
+    help = 'Write every past work or received message out as CSV or JSON, streaming rows from the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('records', choices=MODELS)
+        parser.add_argument('--format', choices=FORMATS,
+                            help='File format; taken from the --output extension when left out, else CSV')
+        parser.add_argument('--output', help='Write to this file instead of stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched from the database at a time')
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or format_from_name(options['output'] or '')
+        chunks = export_chunks(MODELS[options['records']].objects.all(), file_format, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as stream:
+                stream.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from ...bulk import FORMATS, format_from_name, import_pastworks, read_rows
+
+
+class Command(BaseCommand):
+    help = ('Create or update past works from a CSV or JSON file, matching existing ones on their name '
+            'or GitHub link')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, or - for standard input')
+        parser.add_argument('--format', choices=FORMATS,
+                            help='File format; taken from the file extension when left out')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Rows validated and written together')
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or format_from_name(options['path'])
+        try:
+            if options['path'] == '-':
+                result = import_pastworks(read_rows(sys.stdin, file_format), options['batch_size'])
+            else:
+                with open(options['path'], newline='', encoding='utf-8-sig') as stream:
+                    result = import_pastworks(read_rows(stream, file_format), options['batch_size'])
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+
+        for number, message in result['errors']:
+            self.stderr.write(f'Row {number}: {message}')
+        self.stdout.write(f'Created {result["created"]}, updated {result["updated"]} and skipped '
+                          f'{len(result["errors"])} past work(s)')
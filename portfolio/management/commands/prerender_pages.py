@@ -0,0 +1,30 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from ...prerender import prerender_pages
+
+
+class Command(BaseCommand):
+    help = 'Write the home page, every past works list page and every past work page to PRERENDER_ROOT as HTML'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', dest='rebuild_all',
+                            help='Render every page again instead of only the ones whose files are missing')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Number of processes rendering pages')
+        parser.add_argument('--forever', action='store_true',
+                            help='Keep re-rendering the pages that content changes discard')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait between passes')
+
+    def handle(self, *args, **options):
+        rebuild_all = options['rebuild_all']
+        while True:
+            rendered = prerender_pages(workers=options['workers'], rebuild_all=rebuild_all)
+            rebuild_all = False
+            if options['verbosity'] > 1 or not options['forever']:
+                self.stdout.write(f'Rendered {rendered} page(s)')
+            if not options['forever']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from ...outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Send the pending emails in the outbox, retrying failures with exponential backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='Number of emails sent over each mail connection')
+        parser.add_argument('--forever', action='store_true',
+                            help='Keep polling the outbox instead of exiting once it is drained')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait between polls of an empty outbox')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = 0
+            claimed = deliver_batch(options['batch_size'])
+            while claimed:
+                sent += claimed
+                claimed = deliver_batch(options['batch_size'])
+            if options['verbosity'] > 1 or not options['forever']:
+                self.stdout.write(f'Processed {sent} outbox email(s)')
+            if not options['forever']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from ...search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the past work full-text search index from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['database'])
+        backend.rebuild()
+        self.stdout.write(f'Rebuilt the {type(backend).__name__} index')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from ...digest import queue_digests
+from ...outbox import deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Email a digest of the messages received since the last one, grouped by reason'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Send whatever is waiting even if the digest size or age has not been reached')
+        parser.add_argument('--queue-only', action='store_true',
+                            help='Leave the digests in the outbox for process_outbox to send')
+        parser.add_argument('--batch-size', type=int, default=50,
+                            help='Number of outbox emails sent over each mail connection')
+
+    def handle(self, *args, **options):
+        queued = queue_digests(options['force'])
+        sent = 0
+        if queued and not options['queue_only']:
+            claimed = deliver_batch(options['batch_size'])
+            while claimed:
+                sent += claimed
+                claimed = deliver_batch(options['batch_size'])
+        self.stdout.write(f'Queued {queued} digest(s), processed {sent} outbox email(s)')
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ...assets import fetch_vendor_assets
+
+
+class Command(BaseCommand):
+    help = 'Download the pinned Bootstrap, jQuery and Popper files into the static directory so they are served locally'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Download the files again even when they are already there')
+
+    def handle(self, *args, **options):
+        try:
+            written = fetch_vendor_assets(settings.STATICFILES_DIRS[0], force=options['force'])
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        self.stdout.write(f'Vendored {len(written)} asset(s)')
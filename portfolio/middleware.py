@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import ExitStack
+from functools import partial
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+from .cache import fill_placeholders
+from .prerender import prerendered_file
+
+logger = logging.getLogger('portfolio.metrics')
+
+
+class RequestMetricsMiddleware:
+    """
+    Time each request, its SQL and its template rendering.
+
+    The figures go out in a ``Server-Timing`` header and a JSON log line on
+    the ``portfolio.metrics`` logger, which warns when a view runs more than
+    ``REQUEST_QUERY_BUDGET`` queries. Unless ``REQUEST_METRICS_ENABLED`` is
+    set the middleware drops itself from the chain at startup. List it first
+    in ``MIDDLEWARE`` so its timings cover the rest of the chain.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.metrics = {'view': None, 'queries': 0, 'sql': 0.0, 'render': 0.0}
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(partial(self.time_query, metrics)))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        response['Server-Timing'] = ', '.join([
+            f'total;dur={total * 1000:.1f}',
+            f'sql;dur={metrics["sql"] * 1000:.1f};desc="{metrics["queries"]} queries"',
+            f'render;dur={metrics["render"] * 1000:.1f}',
+        ])
+        over_budget = metrics['queries'] > settings.REQUEST_QUERY_BUDGET
+        logger.log(logging.WARNING if over_budget else logging.INFO, json.dumps({
+            'view': metrics['view'],
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 3),
+            'queries': metrics['queries'],
+            'sql_ms': round(metrics['sql'] * 1000, 3),
+            'render_ms': round(metrics['render'] * 1000, 3),
+            'over_query_budget': over_budget,
+        }))
+        return response
+
+    @staticmethod
+    def time_query(metrics, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics['queries'] += 1
+            metrics['sql'] += time.perf_counter() - start
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        request.metrics['view'] = (view_class or view_func).__name__
+
+    def process_template_response(self, request, response):
+        # The handler renders straight after the last process_template_response hook.
+        start = time.perf_counter()
+
+        def record_render_time(rendered_response):
+            request.metrics['render'] += time.perf_counter() - start
+
+        response.add_post_render_callback(record_render_time)
+        return response
+
+
+class PrerenderedPageMiddleware:
+    """
+    Answer anonymous GETs for pages written by ``prerender_pages`` from disk.
+
+    A visitor with a session or pending flash messages always reaches the
+    view. The placeholders in the file are filled in with the visitor's own
+    CSRF token and a fresh form timestamp, so list this after
+    ``CsrfViewMiddleware``; listing it last keeps the other middleware's
+    response headers. Unless ``PRERENDER_ENABLED``
+    is set the middleware drops itself from the chain at startup.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PRERENDER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (request.method in ('GET', 'HEAD')
+                and settings.SESSION_COOKIE_NAME not in request.COOKIES
+                and CookieStorage.cookie_name not in request.COOKIES):
+            page = prerendered_file(request)
+            if page is not None:
+                try:
+                    content = page.read_text()
+                except FileNotFoundError:
+                    pass
+                else:
+                    return HttpResponse(fill_placeholders(content, request))
+        return self.get_response(request)
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    whitenoise's middleware, able to run in an async middleware chain too.
+
+    whitenoise 5 is sync-only, and one sync-only middleware makes Django
+    run the whole chain under ASGI through its single sync thread, async
+    views included.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if asyncio.iscoroutinefunction(get_response):
+            # Marks the instance as async for Django, as MiddlewareMixin does.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        # A dict lookup (a stat in DEBUG), cheap enough for the event loop.
+        response = self.process_request(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
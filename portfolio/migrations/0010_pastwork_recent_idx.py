@@ -0,0 +1,17 @@
+# Generated by Django 3.1.6 on 2026-10-18 12:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0009_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pastwork',
+            index=models.Index(fields=['-date_modified', '-id'], name='pastwork_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+
+# The SQL is written out here rather than taken from portfolio.search, so
+# later changes to the search backends or to PastWork leave this migration
+# creating the index exactly as it stood.
+SQLITE_TABLE = 'portfolio_pastwork_fts'
+POSTGRES_TABLE = 'portfolio_pastwork_search'
+
+
+def columns(apps, schema_editor):
+    """The quoted PastWork table and column names as of this migration."""
+    PastWork = apps.get_model('portfolio', 'PastWork')
+    quote = schema_editor.quote_name
+    fields = ('id', 'name', 'description', 'motivation', 'tools_used')
+    return {'table': quote(PastWork._meta.db_table),
+            **{field: quote(PastWork._meta.get_field(field).column) for field in fields}}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5('
+                              f'name, description, motivation, tools_used, tokenize = "porter unicode61")')
+        schema_editor.execute(
+            'INSERT INTO {fts} (rowid, name, description, motivation, tools_used) '
+            "SELECT {id}, {name}, {description}, COALESCE({motivation}, ''), COALESCE({tools_used}, '') "
+            'FROM {table}'.format(fts=SQLITE_TABLE, **columns(apps, schema_editor)))
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE TABLE {search} (pastwork_id integer PRIMARY KEY REFERENCES {table} ({id}) '
+            'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)'.format(
+                search=POSTGRES_TABLE, **columns(apps, schema_editor)))
+        schema_editor.execute(f'CREATE INDEX {POSTGRES_TABLE}_document_idx ON {POSTGRES_TABLE} USING GIN (document)')
+        schema_editor.execute(
+            'INSERT INTO {search} (pastwork_id, document) '
+            "SELECT {id}, setweight(to_tsvector('english', {name}), 'A') || "
+            "setweight(to_tsvector('english', {description}), 'B') || "
+            "setweight(to_tsvector('english', COALESCE({tools_used}, '')), 'C') || "
+            "setweight(to_tsvector('english', COALESCE({motivation}, '')), 'D') "
+            'FROM {table}'.format(search=POSTGRES_TABLE, **columns(apps, schema_editor)))
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {SQLITE_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {POSTGRES_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0010_pastwork_recent_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
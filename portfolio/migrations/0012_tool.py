@@ -0,0 +1,26 @@
+# Generated by Django 3.1.6 on 2026-10-18 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0011_pastwork_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tool',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('slug', models.SlugField(unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='pastwork',
+            name='tools',
+            field=models.ManyToManyField(blank=True, related_name='pastworks', to='portfolio.Tool'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def populate_tools(apps, schema_editor):
+    from portfolio.tools import parse_tools
+    PastWork = apps.get_model('portfolio', 'PastWork')
+    Tool = apps.get_model('portfolio', 'Tool')
+    tools = {}
+    for pastwork in PastWork.objects.exclude(tools_used__isnull=True).exclude(tools_used=''):
+        for slug, name in parse_tools(pastwork.tools_used):
+            if slug not in tools:
+                tools[slug] = Tool.objects.get_or_create(slug=slug, defaults={'name': name})[0]
+            pastwork.tools.add(tools[slug])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0012_tool'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tools, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.1.6 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0013_populate_tools'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedMessage',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('reason', models.CharField(max_length=25)),
+                ('name', models.CharField(max_length=50)),
+                ('email', models.EmailField(max_length=254)),
+                ('message', models.TextField()),
+                ('date', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.1.6 on 2026-10-18 12:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0014_archivedmessage'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedmessage',
+            name='date',
+            field=models.DateTimeField(),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='reason',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='portfolio.reason'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedmessage',
+            index=models.Index(fields=['-date', '-id'], name='archivedmessage_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['reason', '-id'], name='message_reason_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['date', 'id'], name='message_date_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.1.6 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0015_message_indexes'),
+    ]
+
+    operations = [
+        # Every existing message was emailed on its own when it arrived.
+        migrations.AddField(
+            model_name='message',
+            name='notified',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='message',
+            name='notified',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(condition=models.Q(notified=False), fields=['date', 'id'], name='message_unnotified_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+import re
+
+from django.db import migrations
+from django.db.models import Q
+from django.utils.text import slugify
+
+# A copy of portfolio.tools.parse_tools as it stood, so later changes to it leave this migration alone.
+TOOL_SEPARATORS = re.compile(r'[,;/\n]|\band\b')
+
+
+def parse_tools(tools_used):
+    tools = {}
+    for name in TOOL_SEPARATORS.split(tools_used or ''):
+        name = ' '.join(name.split())[:50]
+        slug_name = 'dot' + name[1:] if name.startswith('.') else name
+        slug = slugify(slug_name.replace('+', 'plus').replace('#', 'sharp'))[:50]
+        if slug and slug not in tools:
+            tools[slug] = name
+    return list(tools.items())
+
+
+def relink_symbol_tools(apps, schema_editor):
+    """Past works listing C++, C# or .NET were linked to the tools C and NET; link them to their own."""
+    PastWork = apps.get_model('portfolio', 'PastWork')
+    Tool = apps.get_model('portfolio', 'Tool')
+    affected = PastWork.objects.filter(Q(tools_used__contains='+') | Q(tools_used__contains='#')
+                                       | Q(tools_used__contains='.'))
+    for pastwork in affected:
+        pastwork.tools.set([Tool.objects.get_or_create(slug=slug, defaults={'name': name})[0]
+                            for slug, name in parse_tools(pastwork.tools_used)])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0016_message_notified'),
+    ]
+
+    operations = [
+        migrations.RunPython(relink_symbol_tools, migrations.RunPython.noop),
+    ]
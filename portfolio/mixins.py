@@ -0,0 +1,113 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+from .cache import (CSRF_TOKEN_PLACEHOLDER, FORM_RENDERED_AT_PLACEHOLDER, fill_placeholders, get_content_versions,
+                    page_cache_key)
+from .ratelimit import SlidingWindowRateLimiter, client_ip
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serve anonymous GETs from a cached copy of the rendered page.
+
+    The cache key carries the content version of every model in
+    ``cache_models``, so a save or delete on any of them makes the next
+    request render afresh. The CSRF token and the contact form's timestamp
+    are cached as placeholders and filled in for each visitor on the way
+    out. Pages rendered for ``prerender_pages`` keep the placeholders and
+    skip the cache altogether. Only the query parameters listed in
+    ``cache_query_params`` are part of the key, so made-up ones cannot
+    fill the cache with copies of the same page.
+    """
+    cache_models = ()
+    cache_query_params = ()
+    caching_page = False
+
+    def page_cache_path(self, request):
+        params = [(key, value) for key in sorted(self.cache_query_params) for value in request.GET.getlist(key)]
+        return f'{request.path}?{urlencode(params)}' if params else request.path
+
+    def page_is_cacheable(self, request):
+        return (request.method in ('GET', 'HEAD')
+                and not getattr(request, 'prerendering', False)
+                and not request.user.is_authenticated
+                and not get_messages(request))
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.page_is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache_key(self.page_cache_path(request), get_content_versions(*self.cache_models))
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(fill_placeholders(content, request))
+
+        self.caching_page = True
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'render'):
+            response.render()
+            content = response.content.decode(response.charset)
+            cache.set(key, content, settings.PAGE_CACHE_SECONDS)
+            response.content = fill_placeholders(content, request)
+        return response
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if self.caching_page or getattr(self.request, 'prerendering', False):
+            context['csrf_token'] = CSRF_TOKEN_PLACEHOLDER
+            context['form_rendered_at'] = FORM_RENDERED_AT_PLACEHOLDER
+        return context
+
+
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match/If-Modified-Since with a 304 before the view runs.
+
+    ``get_etag`` and ``get_last_modified`` should be cheap: they run ahead
+    of the view on every request. Either may return None. With
+    ``conditional_for_anonymous_only`` set, signed-in users (whose pages
+    carry edit controls) always get the page rendered afresh.
+    """
+    conditional_for_anonymous_only = False
+
+    def get_etag(self, request, *args, **kwargs):
+        return None
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.conditional_for_anonymous_only and request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        conditional_dispatch = condition(etag_func=self.get_etag,
+                                         last_modified_func=self.get_last_modified)(super().dispatch)
+        return conditional_dispatch(request, *args, **kwargs)
+
+
+class SendMessageRateLimitMixin:
+    """
+    Turn away POSTs from a client address or sender email that has gone over
+    ``SEND_MESSAGE_RATE_LIMIT`` submissions per ``SEND_MESSAGE_RATE_WINDOW`` seconds.
+    """
+
+    def get_rate_limit_identities(self, request):
+        identities = [f'ip:{client_ip(request)}']
+        email = request.POST.get('email', '').strip().lower()
+        if email:
+            identities.append(f'email:{email}')
+        return identities
+
+    def post(self, request, *args, **kwargs):
+        limiter = SlidingWindowRateLimiter(settings.SEND_MESSAGE_RATE_LIMIT, settings.SEND_MESSAGE_RATE_WINDOW,
+                                           cache_alias=settings.RATELIMIT_CACHE)
+        retry_after = limiter.hit(*self.get_rate_limit_identities(request))
+        if retry_after:
+            response = HttpResponse('Too many messages, please try again later.', status=429,
+                                    content_type='text/plain')
+            response['Retry-After'] = str(retry_after)
+            return response
+        return super().post(request, *args, **kwargs)
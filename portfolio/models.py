@@ -1,5 +1,6 @@
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 
 class About(models.Model):
@@ -33,11 +34,21 @@ class Reason(models.Model):
 
 
 class Message(models.Model):
-    reason = models.ForeignKey(Reason, on_delete=models.CASCADE)
+    # Indexed by message_reason_recent_idx, which leads with the reason.
+    reason = models.ForeignKey(Reason, on_delete=models.CASCADE, db_index=False)
     name = models.CharField(max_length=50)
     email = models.EmailField()
     message = models.TextField()
     date = models.DateTimeField(auto_now_add=True)
+    # False until the message has gone out in a notification digest.
+    notified = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['reason', '-id'], name='message_reason_recent_idx'),
+            models.Index(fields=['date', 'id'], name='message_date_idx'),
+            models.Index(fields=['date', 'id'], name='message_unnotified_idx', condition=models.Q(notified=False)),
+        ]
 
     def __str__(self):
         return f'message from {self.email}'
@@ -46,18 +57,88 @@ class Message(models.Model):
         return reverse('home')
 
 
+class ArchivedMessage(models.Model):
+    """
+    A message moved out of the inbox by ``manage.py archive_messages``.
+
+    It keeps the message's id and copies its reason's purpose, so it needs
+    no join and outlives the reason.
+    """
+    id = models.IntegerField(primary_key=True)
+    reason = models.CharField(max_length=25)
+    name = models.CharField(max_length=50)
+    email = models.EmailField()
+    message = models.TextField()
+    date = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date', '-id'], name='archivedmessage_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f'message from {self.email}'
+
+
+class Tool(models.Model):
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
 class PastWork(models.Model):
     name = models.CharField(max_length=50, unique=True)
     description = models.CharField(max_length=150)
     motivation = models.TextField(blank=True, null=True)
     tools_used = models.CharField(blank=True, null=True, max_length=250)
+    tools = models.ManyToManyField(Tool, blank=True, related_name='pastworks')
     github_link = models.URLField(max_length=100, unique=True)
     page_link = models.URLField(max_length=100, blank=True, null=True)
     date_added = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date_modified', '-id'], name='pastwork_recent_idx'),
+        ]
+
     def __str__(self):
         return f'{self.name}'
 
     def get_absolute_url(self):
-        return reverse('home')
\ No newline at end of file
+        return reverse('home')
+
+
+class OutboxEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    recipients = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+    date_sent = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} to {self.recipients}'
+
+    def recipient_list(self):
+        return [recipient for recipient in self.recipients.split(',') if recipient]
@@ -0,0 +1,86 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_NOTIFICATION_SUBJECT = 'Message from Portfolio App'
+
+
+def queue_email(subject, body, recipients):
+    return OutboxEmail.objects.create(subject=subject, body=body, from_email=settings.EMAIL_HOST_USER,
+                                      recipients=','.join(recipients))
+
+
+def queue_message_notification(message):
+    body = f'{message.name} says {message.reason.purpose}\n\nTheir exact statement was "{message.message}"\n' \
+           f'Here is their email if you need to reach them: {message.email}'
+    return queue_email(MESSAGE_NOTIFICATION_SUBJECT, body, [f'{settings.EMAIL_RECEIVER}'])
+
+
+def claim_batch(batch_size):
+    """
+    Lease up to ``batch_size`` due emails to the calling worker.
+
+    Claimed rows have their next attempt pushed past the lease, so a second
+    worker skips them and a worker that dies mid-batch only delays them.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = OutboxEmail.objects.filter(status=OutboxEmail.PENDING, next_attempt_at__lte=now)
+        due = due.order_by('next_attempt_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        batch = list(due[:batch_size])
+        OutboxEmail.objects.filter(id__in=[email.id for email in batch]).update(
+            next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS))
+    return batch
+
+
+def _record_failure(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.FAILED
+    else:
+        backoff = settings.OUTBOX_RETRY_SECONDS * 2 ** (email.attempts - 1)
+        email.next_attempt_at = timezone.now() + timedelta(seconds=backoff)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+    logger.warning('Outbox email %s failed (attempt %s): %s', email.id, email.attempts, error)
+
+
+def deliver_batch(batch_size):
+    """Send one batch of due emails over a single mail connection. Returns how many were claimed."""
+    batch = claim_batch(batch_size)
+    if not batch:
+        return 0
+
+    mail_connection = get_connection(fail_silently=False)
+    try:
+        mail_connection.open()
+    except Exception as error:
+        for email in batch:
+            _record_failure(email, error)
+        return len(batch)
+
+    try:
+        for email in batch:
+            message = EmailMessage(email.subject, email.body, email.from_email or None, email.recipient_list(),
+                                   connection=mail_connection)
+            try:
+                message.send()
+            except Exception as error:
+                _record_failure(email, error)
+            else:
+                email.status = OutboxEmail.SENT
+                email.attempts += 1
+                email.date_sent = timezone.now()
+                email.save(update_fields=['status', 'attempts', 'date_sent'])
+    finally:
+        mail_connection.close()
+    return len(batch)
@@ -0,0 +1,140 @@
+import json
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+CURSOR_SALT = 'portfolio.pagination'
+
+
+class KeysetPage:
+    """A page of results located by a cursor instead of an offset, so it never needs a COUNT."""
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+
+def _ordering_fields(model, ordering):
+    return [model._meta.get_field(field.lstrip('-')) for field in ordering]
+
+
+def sign_cursor(values):
+    # Unlike signing.dumps this carries no timestamp, so the cursor for a row
+    # (and with it the URL of every page) stays the same from one render to the next.
+    data = signing.b64_encode(json.dumps(values, separators=(',', ':')).encode()).decode()
+    return signing.Signer(salt=CURSOR_SALT).sign(data)
+
+
+def unsign_cursor(token):
+    return json.loads(signing.b64_decode(signing.Signer(salt=CURSOR_SALT).unsign(token).encode()))
+
+
+def encode_cursor(obj, ordering):
+    values = [field.value_to_string(obj) for field in _ordering_fields(type(obj), ordering)]
+    return sign_cursor(values)
+
+
+def decode_cursor(token, model, ordering):
+    fields = _ordering_fields(model, ordering)
+    try:
+        values = unsign_cursor(token)
+        if len(values) != len(fields):
+            raise ValueError
+        return [field.to_python(value) for field, value in zip(fields, values)]
+    except (signing.BadSignature, ValidationError, ValueError, TypeError):
+        raise Http404('Invalid page cursor')
+
+
+def cursor_filter(ordering, values, forward=True):
+    """Rows strictly after ``values`` in ``ordering`` (or strictly before them when not ``forward``)."""
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') == forward else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def _reverse_ordering(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def keyset_page(queryset, ordering, page_size, after=None, before=None):
+    """
+    Fetch the page of ``queryset`` that follows the ``after`` cursor or precedes the ``before`` one.
+
+    ``ordering`` must end in a unique field so that every row has a distinct
+    position; each page is then one indexed range scan however deep it is.
+    """
+    model = queryset.model
+    if before:
+        values = decode_cursor(before, model, ordering)
+        queryset = queryset.filter(cursor_filter(ordering, values, forward=False))
+        queryset = queryset.order_by(*_reverse_ordering(ordering))
+    elif after:
+        values = decode_cursor(after, model, ordering)
+        queryset = queryset.filter(cursor_filter(ordering, values)).order_by(*ordering)
+    else:
+        queryset = queryset.order_by(*ordering)
+
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if before:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, bool(after)
+
+    next_cursor = encode_cursor(rows[-1], ordering) if has_next and rows else None
+    previous_cursor = encode_cursor(rows[0], ordering) if has_previous and rows else None
+    return KeysetPage(rows, has_next and bool(rows), has_previous and bool(rows), next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    Paginate a ListView with ``?after=``/``?before=`` cursors over its ``ordering``.
+    """
+
+    def paginate_queryset(self, queryset, page_size):
+        page = keyset_page(queryset, self.get_ordering(), page_size,
+                           after=self.request.GET.get('after'), before=self.request.GET.get('before'))
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['page_query'] = page_query(self.request)
+        return context
+
+
+def page_query(request):
+    """The request's query string minus its paging parameters, for pagination.html to carry along."""
+    params = request.GET.copy()
+    for key in ('after', 'before'):
+        params.pop(key, None)
+    return params.urlencode()
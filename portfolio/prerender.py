@@ -0,0 +1,141 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve, reverse
+from .cache import get_content_versions
+from .models import About, Competency, Reason, PastWork, Tool
+from .pagination import keyset_page
+from .views import PastWorksView
+
+PRERENDER_MODELS = (About, Competency, Reason, PastWork, Tool)
+
+
+def page_group(url_name, kwargs):
+    """The directory a page's files live in, so a change can discard them together."""
+    if url_name in ('home', 'pastworks'):
+        return url_name
+    if url_name == 'pastwork':
+        return f'pastwork-{kwargs["pk"]}'
+    return None
+
+
+def page_file(group, full_path):
+    name = hashlib.sha1(full_path.encode()).hexdigest()
+    return Path(settings.PRERENDER_ROOT) / group / f'{name}.html'
+
+
+def prerendered_file(request):
+    """Where the pre-rendered copy of ``request``'s page would be, or None if it is not a pre-rendered page."""
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+    group = page_group(match.url_name, match.kwargs)
+    return page_file(group, request.get_full_path()) if group else None
+
+
+def discard_prerendered_pages(model, pk=None):
+    """
+    Delete the files of every page that shows ``model``.
+
+    A past work appears on the home page, the past works list (whose pages
+    all shift when one is added or removed) and its own page; without a
+    ``pk`` every past work page goes.
+    """
+    if model is PastWork:
+        groups = ['home', 'pastworks', f'pastwork-{pk}' if pk is not None else 'pastwork-*']
+    elif model is Tool:
+        groups = ['pastworks']
+    else:
+        groups = ['home']
+    root = Path(settings.PRERENDER_ROOT)
+    for group in groups:
+        for directory in root.glob(group):
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def page_paths():
+    """Every pre-rendered page as ``(group, path)``, following the list's cursors the way its links do."""
+    yield 'home', reverse('home')
+    list_url = reverse('pastworks')
+    queryset = PastWork.objects.only(*(field.lstrip('-') for field in PastWorksView.ordering))
+    after = None
+    while True:
+        page = keyset_page(queryset, PastWorksView.ordering, PastWorksView.paginate_by, after=after)
+        yield 'pastworks', f'{list_url}?after={after}' if after else list_url
+        if page.previous_cursor:
+            yield 'pastworks', f'{list_url}?before={page.previous_cursor}'
+        if not page.has_next():
+            break
+        after = page.next_cursor
+
+    for pk in PastWork.objects.values_list('pk', flat=True).iterator():
+        yield f'pastwork-{pk}', reverse('pastwork', kwargs={'pk': pk})
+
+
+def render_page(group, path):
+    """Render ``path`` as an anonymous visitor would see it and write it out. Returns whether a file was written."""
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    request.prerendering = True
+    match = resolve(request.path_info)
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+    except Http404:
+        return False
+    if response.status_code != 200:
+        return False
+    if hasattr(response, 'render'):
+        response.render()
+
+    target = page_file(group, path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Write beside the target and rename so the middleware never reads half a page.
+    descriptor, temporary = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+    with os.fdopen(descriptor, 'wb') as page:
+        page.write(response.content)
+    os.replace(temporary, target)
+    return True
+
+
+def _render_task(task):
+    return render_page(*task)
+
+
+def prerender_pages(workers=1, rebuild_all=False):
+    """
+    Render every page whose file is missing, spread over ``workers`` processes.
+
+    Returns the number of files written. The signals discard the files of
+    a page when its content changes, so a run after an edit only renders
+    the pages that edit touched; ``rebuild_all`` starts from scratch.
+    """
+    if rebuild_all:
+        shutil.rmtree(settings.PRERENDER_ROOT, ignore_errors=True)
+    versions = get_content_versions(*PRERENDER_MODELS)
+    tasks = [(group, path) for group, path in page_paths() if not page_file(group, path).exists()]
+
+    if workers > 1 and len(tasks) > 1:
+        # Forked workers must open their own database connections.
+        connections.close_all()
+        with ProcessPoolExecutor(workers, initializer=django.setup) as executor:
+            rendered = sum(executor.map(_render_task, tasks, chunksize=max(len(tasks) // (workers * 4), 1)))
+    else:
+        rendered = sum(render_page(group, path) for group, path in tasks)
+
+    # An edit made while the pages were rendering may have landed after its
+    # files were discarded but before they were written, so discard them again.
+    for model, before, after in zip(PRERENDER_MODELS, versions, get_content_versions(*PRERENDER_MODELS)):
+        if before != after:
+            discard_prerendered_pages(model)
+    return rendered
@@ -0,0 +1,76 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def client_ip(request):
+    """The client address, read through ``RATELIMIT_PROXY_COUNT`` trusted proxies."""
+    proxy_count = settings.RATELIMIT_PROXY_COUNT
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxy_count and forwarded_for:
+        addresses = [address.strip() for address in forwarded_for.split(',')]
+        if len(addresses) >= proxy_count:
+            return addresses[-proxy_count]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class SlidingWindowRateLimiter:
+    """
+    Allow ``limit`` hits per ``window`` seconds for each identity.
+
+    The rate is estimated from the current fixed window's counter plus the
+    previous window's counter weighted by how much of it still overlaps the
+    sliding window, so a hit costs one ``get_many`` and one ``incr`` on any
+    cache backend no matter how busy the identity is.
+    """
+
+    def __init__(self, limit, window, cache_alias='default', prefix='portfolio:ratelimit'):
+        self.limit = limit
+        self.window = window
+        self.cache = caches[cache_alias]
+        self.prefix = prefix
+
+    def _key(self, identity, window_index):
+        identity_hash = hashlib.md5(identity.encode()).hexdigest()
+        return f'{self.prefix}:{identity_hash}:{window_index}'
+
+    def _retry_after(self, previous, current, elapsed):
+        if current < self.limit:
+            wait = self.window * (1 - (self.limit - current) / previous) - elapsed
+        else:
+            wait = (self.window - elapsed) + self.window * (1 - self.limit / current)
+        return max(1, math.ceil(wait))
+
+    def hit(self, *identities):
+        """
+        Record a hit for every identity, unless one of them is over the limit.
+
+        Returns 0 when the hit is allowed, otherwise the number of seconds to
+        wait before the busiest identity is allowed again.
+        """
+        now = time.time()
+        window_index = int(now // self.window)
+        elapsed = now - window_index * self.window
+        current_keys = [self._key(identity, window_index) for identity in identities]
+        previous_keys = [self._key(identity, window_index - 1) for identity in identities]
+        counts = self.cache.get_many(current_keys + previous_keys)
+
+        retry_after = 0
+        for current_key, previous_key in zip(current_keys, previous_keys):
+            current = counts.get(current_key, 0)
+            previous = counts.get(previous_key, 0)
+            if previous * (1 - elapsed / self.window) + current >= self.limit:
+                retry_after = max(retry_after, self._retry_after(previous, current, elapsed))
+        if retry_after:
+            return retry_after
+
+        for key in current_keys:
+            if not self.cache.add(key, 1, self.window * 2):
+                try:
+                    self.cache.incr(key)
+                except ValueError:
+                    self.cache.add(key, 1, self.window * 2)
+        return 0
@@ -0,0 +1,215 @@
+import re
+
+from django.core import signing
+from django.db import connections
+from django.http import Http404
+from .models import PastWork
+from .pagination import KeysetPage, sign_cursor, unsign_cursor
+
+SQLITE_TABLE = 'portfolio_pastwork_fts'
+POSTGRES_TABLE = 'portfolio_pastwork_search'
+
+
+def search_terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+class SearchBackend:
+    """
+    Ranked full-text search over past works, paged by (score, id) cursors.
+
+    Subclasses keep an inverted index of every PastWork up to date through
+    ``index``/``remove`` (called from the model signals) and answer
+    ``ranked_sql``, which yields ``(id, score)`` rows with higher scores
+    being better matches.
+    """
+
+    def __init__(self, using='default'):
+        self.connection = connections[using]
+
+    def create_index(self):
+        raise NotImplementedError
+
+    def drop_index(self):
+        raise NotImplementedError
+
+    def index(self, pastworks):
+        raise NotImplementedError
+
+    def remove(self, pk):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+    def ranked_sql(self, terms):
+        raise NotImplementedError
+
+    def search(self, query, page_size, after=None, before=None):
+        """The page of matches for ``query`` that follows the ``after`` cursor or precedes the ``before`` one."""
+        terms = search_terms(query)
+        if not terms:
+            return KeysetPage([], False, False, None, None)
+
+        sql, params = self.ranked_sql(terms)
+        sql = f'SELECT id, score FROM ({sql}) AS ranked'
+        if before:
+            score, pk = decode_search_cursor(before)
+            sql += ' WHERE score > %s OR (score = %s AND id < %s) ORDER BY score, id DESC'
+            params += [score, score, pk]
+        elif after:
+            score, pk = decode_search_cursor(after)
+            sql += ' WHERE score < %s OR (score = %s AND id > %s) ORDER BY score DESC, id'
+            params += [score, score, pk]
+        else:
+            sql += ' ORDER BY score DESC, id'
+        sql += ' LIMIT %s'
+        params.append(page_size + 1)
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if before:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(after)
+        has_next, has_previous = has_next and bool(rows), has_previous and bool(rows)
+
+        pastworks = PastWork.objects.prefetch_related('tools').in_bulk([pk for pk, _ in rows])
+        results = [pastworks[pk] for pk, _ in rows if pk in pastworks]
+        next_cursor = sign_cursor([rows[-1][1], rows[-1][0]]) if has_next else None
+        previous_cursor = sign_cursor([rows[0][1], rows[0][0]]) if has_previous else None
+        return KeysetPage(results, has_next, has_previous, next_cursor, previous_cursor)
+
+
+def decode_search_cursor(token):
+    try:
+        score, pk = unsign_cursor(token)
+        return float(score), int(pk)
+    except (signing.BadSignature, TypeError, ValueError):
+        raise Http404('Invalid page cursor')
+
+
+class SqliteSearchBackend(SearchBackend):
+    """An FTS5 table whose rowids are the PastWork ids, ranked with bm25."""
+
+    def create_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5('
+                           f'name, description, motivation, tools_used, tokenize = "porter unicode61")')
+
+    def drop_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {SQLITE_TABLE}')
+
+    def index(self, pastworks):
+        rows = [(pastwork.id, pastwork.name, pastwork.description, pastwork.motivation or '',
+                 pastwork.tools_used or '') for pastwork in pastworks]
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(f'INSERT INTO {SQLITE_TABLE} (rowid, name, description, motivation, tools_used) '
+                               f'VALUES (%s, %s, %s, %s, %s)', rows)
+
+    def remove(self, pk):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [pk])
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+            cursor.execute(f'INSERT INTO {SQLITE_TABLE} (rowid, name, description, motivation, tools_used) '
+                           f'SELECT id, name, description, COALESCE(motivation, \'\'), COALESCE(tools_used, \'\') '
+                           f'FROM {PastWork._meta.db_table}')
+
+    def ranked_sql(self, terms):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        # bm25 is lower-is-better, so negate it; the weights favour the name.
+        return (f'SELECT rowid AS id, -bm25({SQLITE_TABLE}, 10.0, 5.0, 1.0, 3.0) AS score '
+                f'FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s', [match])
+
+
+class PostgresSearchBackend(SearchBackend):
+    """A weighted tsvector per PastWork in a side table with a GIN index."""
+
+    document_sql = ("setweight(to_tsvector('english', {name}), 'A') || "
+                    "setweight(to_tsvector('english', {description}), 'B') || "
+                    "setweight(to_tsvector('english', COALESCE({tools_used}, '')), 'C') || "
+                    "setweight(to_tsvector('english', COALESCE({motivation}, '')), 'D')")
+
+    def create_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'CREATE TABLE {POSTGRES_TABLE} ('
+                           f'pastwork_id integer PRIMARY KEY REFERENCES {PastWork._meta.db_table} (id) '
+                           f'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+                           f'document tsvector NOT NULL)')
+            cursor.execute(f'CREATE INDEX {POSTGRES_TABLE}_document_idx ON {POSTGRES_TABLE} USING GIN (document)')
+
+    def drop_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE IF EXISTS {POSTGRES_TABLE}')
+
+    def index(self, pastworks):
+        document = self.document_sql.format(name='%s', description='%s', tools_used='%s', motivation='%s')
+        rows = [(pastwork.id, pastwork.name, pastwork.description, pastwork.tools_used, pastwork.motivation)
+                for pastwork in pastworks]
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'INSERT INTO {POSTGRES_TABLE} (pastwork_id, document) VALUES (%s, {document}) '
+                               f'ON CONFLICT (pastwork_id) DO UPDATE SET document = EXCLUDED.document', rows)
+
+    def remove(self, pk):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {POSTGRES_TABLE} WHERE pastwork_id = %s', [pk])
+
+    def rebuild(self):
+        document = self.document_sql.format(name='name', description='description', tools_used='tools_used',
+                                            motivation='motivation')
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {POSTGRES_TABLE}')
+            cursor.execute(f'INSERT INTO {POSTGRES_TABLE} (pastwork_id, document) '
+                           f'SELECT id, {document} FROM {PastWork._meta.db_table}')
+
+    def ranked_sql(self, terms):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        # Round-trip the real-valued rank through double precision so cursors compare exactly.
+        return (f'SELECT pastwork_id AS id, ts_rank_cd(document, query)::double precision AS score '
+                f'FROM {POSTGRES_TABLE}, to_tsquery(\'english\', %s) query WHERE document @@ query', [tsquery])
+
+
+class ScanSearchBackend(SearchBackend):
+    """No index at all: a case-insensitive scan of every row, kept as the benchmark baseline."""
+
+    def create_index(self):
+        pass
+
+    def drop_index(self):
+        pass
+
+    def index(self, pastworks):
+        pass
+
+    def remove(self, pk):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def ranked_sql(self, terms):
+        columns = ('name', 'description', 'motivation', 'tools_used')
+        conditions = ' AND '.join(
+            '(' + ' OR '.join(f'LOWER(COALESCE({column}, \'\')) LIKE %s' for column in columns) + ')'
+            for _ in terms)
+        params = [f'%{term}%' for term in terms for _ in columns]
+        return f'SELECT id, 0.0 AS score FROM {PastWork._meta.db_table} WHERE {conditions}', params
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SqliteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend(using='default'):
+    return SEARCH_BACKENDS.get(connections[using].vendor, ScanSearchBackend)(using)
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from .cache import bump_content_version
+from .db import check_database_connections, count_new_connection
+from .models import About, Competency, Reason, PastWork, Tool
+from .prerender import discard_prerendered_pages
+from .search import get_search_backend
+from .tools import sync_tools
+
+CONTENT_MODELS = (About, Competency, Reason, PastWork, Tool)
+
+
+def content_changed(sender, instance, **kwargs):
+    bump_content_version(sender)
+    if settings.PRERENDER_ENABLED:
+        discard_prerendered_pages(sender, instance.pk)
+
+
+for content_model in CONTENT_MODELS:
+    post_save.connect(content_changed, sender=content_model)
+    post_delete.connect(content_changed, sender=content_model)
+
+
+def index_pastwork(sender, instance, **kwargs):
+    get_search_backend(kwargs['using']).index([instance])
+
+
+def sync_pastwork_tools(sender, instance, **kwargs):
+    sync_tools([instance])
+
+
+def unindex_pastwork(sender, instance, **kwargs):
+    get_search_backend(kwargs['using']).remove(instance.pk)
+
+
+post_save.connect(index_pastwork, sender=PastWork)
+post_save.connect(sync_pastwork_tools, sender=PastWork)
+post_delete.connect(unindex_pastwork, sender=PastWork)
+
+
+# Runs after Django's own close_old_connections, which is connected first.
+request_started.connect(check_database_connections)
+connection_created.connect(count_new_connection)
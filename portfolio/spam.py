@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+
+logger = logging.getLogger('portfolio.spam')
+
+HONEYPOT_FIELD = 'website'
+RENDERED_AT_FIELD = 'rendered_at'
+RENDERED_AT_SALT = 'portfolio.spam.rendered_at'
+
+URL = re.compile(r'(?:https?://|www\.)\S+', re.IGNORECASE)
+WORD = re.compile(r'\w+')
+
+SIMHASH_BITS = 64
+
+
+def form_timestamp():
+    """A signed copy of the current time for the contact form to send back."""
+    return signing.dumps(time.time(), salt=RENDERED_AT_SALT)
+
+
+def seconds_since_rendered(value, now=None):
+    """How long ago ``form_timestamp`` produced ``value``, or None if it is missing or forged."""
+    try:
+        rendered_at = float(signing.loads(value, salt=RENDERED_AT_SALT))
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return (now or time.time()) - rendered_at
+
+
+def _stable_hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'big')
+
+
+def simhash(text):
+    """
+    A 64-bit fingerprint of ``text`` that changes little when the text does.
+
+    Every word votes on every bit through its own hash, so messages
+    differing by a word or two end up a few bits apart.
+    """
+    votes = [0] * SIMHASH_BITS
+    for word in WORD.findall(text.lower()):
+        word_hash = _stable_hash(word)
+        for bit in range(SIMHASH_BITS):
+            votes[bit] += 1 if word_hash >> bit & 1 else -1
+    return sum(1 << bit for bit, vote in enumerate(votes) if vote > 0)
+
+
+def sender_hash(email):
+    return hashlib.md5(email.strip().lower().encode()).hexdigest()[:12]
+
+
+class RecentMessageIndex:
+    """
+    The fingerprints of the last ``SPAM_DUPLICATE_HISTORY`` accepted
+    messages sent within ``SPAM_DUPLICATE_WINDOW`` seconds, kept under one
+    cache key so a lookup is a single ``get`` and a scan of small integers.
+
+    A message matches a recent one whose fingerprint is within
+    ``SPAM_DUPLICATE_DISTANCE`` bits of its own. Short messages, which say
+    little enough to collide by chance, only match the same sender's.
+    """
+
+    def __init__(self, cache_alias='default', key='portfolio:spam:recent'):
+        self.cache = caches[cache_alias]
+        self.key = key
+
+    def recent(self, now=None):
+        oldest = (now or time.time()) - settings.SPAM_DUPLICATE_WINDOW
+        return [entry for entry in self.cache.get(self.key, []) if entry[2] >= oldest]
+
+    def find(self, fingerprint, email, words, now=None):
+        sender = sender_hash(email)
+        for other, other_sender, _ in self.recent(now):
+            if (bin(fingerprint ^ other).count('1') <= settings.SPAM_DUPLICATE_DISTANCE
+                    and (words >= settings.SPAM_DUPLICATE_MIN_WORDS or sender == other_sender)):
+                return other
+        return None
+
+    def add(self, fingerprint, email, now=None):
+        now = now or time.time()
+        entries = [(fingerprint, sender_hash(email), now)] + self.recent(now)
+        self.cache.set(self.key, entries[:settings.SPAM_DUPLICATE_HISTORY], settings.SPAM_DUPLICATE_WINDOW)
+
+
+@dataclass
+class Verdict:
+    score: float = 0.0
+    reasons: list = field(default_factory=list)
+    duplicate: bool = False
+    fingerprint: int = 0
+
+    @property
+    def spam(self):
+        return self.score >= settings.SPAM_SCORE_THRESHOLD
+
+    @property
+    def accepted(self):
+        return not (self.spam or self.duplicate)
+
+    def add(self, reason, score):
+        self.reasons.append(reason)
+        self.score += score
+
+
+def score_submission(data, index=None, now=None):
+    """
+    Score a contact form submission before anything is written.
+
+    ``data`` holds the submitted fields. A filled honeypot, a form sent back
+    sooner than ``SPAM_MIN_SUBMIT_SECONDS`` after it was rendered (or with
+    no valid timestamp) and a message made mostly of links each add to the
+    score; at ``SPAM_SCORE_THRESHOLD`` the submission is spam. Otherwise it
+    is checked against ``index`` for a near-duplicate of a recent message.
+    """
+    verdict = Verdict()
+    if data.get(HONEYPOT_FIELD):
+        verdict.add('honeypot', 1.0)
+
+    elapsed = seconds_since_rendered(data.get(RENDERED_AT_FIELD), now)
+    if elapsed is None:
+        verdict.add('no_timestamp', 0.5)
+    elif elapsed < settings.SPAM_MIN_SUBMIT_SECONDS:
+        verdict.add('too_fast', 0.6)
+
+    message = data.get('message') or ''
+    links = URL.findall(message)
+    if len(links) > settings.SPAM_MAX_LINKS:
+        verdict.add('links', 0.5)
+    if message.strip() and sum(len(link) for link in links) / len(message.strip()) > 0.5:
+        verdict.add('link_density', 0.5)
+
+    if verdict.spam or index is None:
+        return verdict
+    verdict.fingerprint = simhash(message)
+    verdict.duplicate = index.find(verdict.fingerprint, data.get('email') or '',
+                                   len(WORD.findall(message)), now) is not None
+    if verdict.duplicate:
+        verdict.reasons.append('duplicate')
+    return verdict
+
+
+def log_verdict(verdict, email):
+    logger.info(json.dumps({
+        'event': 'message_dropped',
+        'score': round(verdict.score, 2),
+        'reasons': verdict.reasons,
+        'sender': sender_hash(email or ''),
+    }))
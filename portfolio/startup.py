@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from django.template import engines
+
+
+def project_template_names():
+    """Every template under the project's template directories, by the name views load it with."""
+    engine = engines['django'].engine
+    return sorted(path.relative_to(directory).as_posix()
+                  for directory in map(Path, engine.dirs)
+                  for path in directory.rglob('*.html'))
+
+
+def warm_templates():
+    """
+    Load and compile every project template ahead of the first request.
+
+    Only useful with the cached loader, which keeps the compiled templates
+    for the life of the process. Returns the number of templates loaded.
+    """
+    engine = engines['django'].engine
+    names = project_template_names()
+    for name in names:
+        engine.get_template(name)
+    return len(names)
@@ -0,0 +1,49 @@
+import re
+
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+CSS_STRING_OR_COMMENT = re.compile(r'''("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')|/\*.*?\*/''', re.DOTALL)
+CSS_WHITESPACE = re.compile(r'\s+')
+CSS_SPACE_AROUND_PUNCTUATION = re.compile(r' ?([{};,]) ?')
+
+
+def _squeeze_css(css):
+    css = CSS_WHITESPACE.sub(' ', css)
+    css = CSS_SPACE_AROUND_PUNCTUATION.sub(r'\1', css)
+    return css.replace(';}', '}')
+
+
+def minify_css(css):
+    """Drop comments and needless whitespace from a stylesheet, leaving quoted strings as they are."""
+    pieces = []
+    code = []
+    position = 0
+    for match in CSS_STRING_OR_COMMENT.finditer(css):
+        code.append(css[position:match.start()])
+        if match.group(1):
+            pieces.append(_squeeze_css(''.join(code)))
+            pieces.append(match.group(1))
+            code = []
+        else:
+            code.append(' ')
+        position = match.end()
+    code.append(css[position:])
+    pieces.append(_squeeze_css(''.join(code)))
+    return ''.join(pieces).strip()
+
+
+class MinifiedCompressedManifestStaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    whitenoise's hashed, pre-compressed storage, minifying the project's own
+    stylesheets as collectstatic copies them in.
+
+    Files already named ``*.min.css`` and anything outside ``minify_prefixes``
+    (the admin's and other apps' files) are copied as they are.
+    """
+    minify_prefixes = ('css/',)
+
+    def _save(self, name, content):
+        if name.startswith(self.minify_prefixes) and name.endswith('.css') and not name.endswith('.min.css'):
+            content = ContentFile(minify_css(b''.join(content.chunks()).decode()).encode())
+        return super()._save(name, content)
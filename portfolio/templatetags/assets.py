@@ -0,0 +1,55 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from ..assets import VENDOR_ASSETS, is_vendored
+from ..critical import critical_css as read_critical_css
+
+register = template.Library()
+
+
+def vendor_asset(name):
+    """The asset's URL on this site once ``manage.py vendor_assets`` has fetched it, else its CDN URL."""
+    asset = VENDOR_ASSETS[name]
+    if is_vendored(asset['path']):
+        try:
+            return static(asset['path']), ''
+        except ValueError:
+            # Fetched after the last collectstatic, so not in the manifest yet.
+            pass
+    return asset['url'], format_html(' integrity="{}" crossorigin="anonymous"', asset['integrity'])
+
+
+def stylesheet(url, attributes=''):
+    """
+    A stylesheet link, loaded without blocking the first paint once
+    ``manage.py build_critical_css`` has written the styles that paint needs.
+    """
+    if not read_critical_css():
+        return format_html('<link rel="stylesheet" href="{}"{}>', url, attributes)
+    return format_html(
+        '<link rel="preload" href="{0}" as="style"{1} onload="this.onload=null;this.rel=\'stylesheet\'">'
+        '<noscript><link rel="stylesheet" href="{0}"{1}></noscript>', url, attributes)
+
+
+@register.simple_tag
+def critical_css():
+    css = read_critical_css()
+    # Built from the project's own stylesheets, so there is nothing to escape.
+    return format_html('<style>{}</style>', mark_safe(css)) if css else ''
+
+
+@register.simple_tag
+def local_stylesheet(path):
+    return stylesheet(static(path))
+
+
+@register.simple_tag
+def vendor_stylesheet(name):
+    return stylesheet(*vendor_asset(name))
+
+
+@register.simple_tag
+def vendor_script(name):
+    url, integrity = vendor_asset(name)
+    return format_html('<script src="{}"{} defer></script>', url, integrity)
@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from .utils import create_about, create_pastwork, create_skill
+
+
+class PastWorkApiTests(TestCase):
+    url = None
+    response = None
+
+    def setUp(self):
+        cache.clear()
+        create_pastwork()
+        self.url = reverse('api_pastworks')
+        self.response = self.client.get(self.url)
+
+    def test_serializes_only_the_listed_fields(self):
+        result, = self.response.json()['results']
+        self.assertEqual(result['name'], 'Portfolio')
+        self.assertEqual(set(result), {'id', 'name', 'description', 'motivation', 'tools_used',
+                                       'github_link', 'page_link', 'date_modified'})
+
+    def test_response_carries_strong_etag_and_last_modified(self):
+        self.assertFalse(self.response['ETag'].startswith('W/'))
+        self.assertIn('Last-Modified', self.response)
+
+    def test_matching_etag_gets_304(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_unchanged_since_last_modified_gets_304(self):
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=self.response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleting_a_past_work_changes_the_etag(self):
+        create_pastwork(name='Blog', github_link='https://github.com/blog').delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], self.response['ETag'])
+
+
+class ContentApiTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_abouts(self):
+        about = create_about()
+        response = self.client.get(reverse('api_abouts'))
+        self.assertEqual(response.json(), {'results': [{'id': about.id, 'paragraph': 'I am a backend developer'}]})
+
+    def test_competencies_304_skips_the_database(self):
+        create_skill()
+        response = self.client.get(reverse('api_competencies'))
+        self.assertEqual(response.json()['results'][0]['skill'],
+                         'Development and Source Control (Docker, Git, Github)')
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api_competencies'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
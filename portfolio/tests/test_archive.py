@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from ..archive import archive_batch, archive_messages
+from ..models import ArchivedMessage, Message, Reason
+from .utils import create_and_login_superuser, create_messages
+
+
+def age_messages(days, ids=None):
+    messages = Message.objects.all() if ids is None else Message.objects.filter(id__in=ids)
+    messages.update(date=timezone.now() - timedelta(days=days))
+
+
+class ArchiveMessagesTests(TestCase):
+
+    def setUp(self):
+        self.reason = Reason.objects.create(purpose='Hiring')
+        create_messages(5, [self.reason])
+        self.ids = sorted(Message.objects.values_list('id', flat=True))
+        age_messages(400, self.ids[:3])
+
+    def test_moves_only_messages_past_retention(self):
+        self.assertEqual(archive_messages(older_than_days=365), 3)
+        self.assertEqual(sorted(Message.objects.values_list('id', flat=True)), self.ids[3:])
+        archived = ArchivedMessage.objects.get(id=self.ids[0])
+        self.assertEqual(archived.reason, 'Hiring')
+        self.assertEqual(archived.email, 'sender0@doe.com')
+
+    @override_settings(MESSAGE_RETENTION_DAYS=30)
+    def test_retention_setting(self):
+        self.assertEqual(archive_messages(), 3)
+
+    def test_batches_are_resumable(self):
+        self.assertEqual(archive_messages(older_than_days=365, batch_size=2, max_batches=1), 2)
+        self.assertEqual(ArchivedMessage.objects.count(), 2)
+        self.assertEqual(archive_messages(older_than_days=365, batch_size=2), 1)
+        self.assertEqual(archive_messages(older_than_days=365, batch_size=2), 0)
+        self.assertEqual(ArchivedMessage.objects.count(), 3)
+
+    def test_a_batch_takes_a_fixed_number_of_queries(self):
+        cutoff = timezone.now() - timedelta(days=365)
+        archive_batch(cutoff, 1)
+        with self.assertNumQueries(5):
+            archive_batch(cutoff, 10)
+
+    def test_batch_with_an_already_archived_id_moves_nothing(self):
+        ArchivedMessage.objects.create(id=self.ids[1], reason='Other', name='Someone else', email='other@doe.com',
+                                       message='Archived earlier', date=timezone.now())
+        with self.assertRaises(IntegrityError):
+            archive_messages(older_than_days=365)
+        self.assertEqual(sorted(Message.objects.values_list('id', flat=True)), self.ids)
+        self.assertEqual(ArchivedMessage.objects.count(), 1)
+
+    def test_messages_waiting_for_a_digest_are_kept(self):
+        Message.objects.filter(id=self.ids[0]).update(notified=False)
+        self.assertEqual(archive_messages(older_than_days=365), 2)
+        self.assertFalse(ArchivedMessage.objects.filter(id=self.ids[0]).exists())
+        self.assertFalse(Message.objects.get(id=self.ids[0]).notified)
+
+    def test_archive_outlives_the_reason(self):
+        archive_messages(older_than_days=365)
+        self.reason.delete()
+        self.assertEqual(ArchivedMessage.objects.count(), 3)
+
+    def test_command(self):
+        output = StringIO()
+        call_command('archive_messages', older_than_days=365, stdout=output)
+        self.assertIn('Archived 3 message(s)', output.getvalue())
+
+
+class ArchivedMessagesViewTests(TestCase):
+
+    def setUp(self):
+        create_messages(3, [Reason.objects.create(purpose='Hiring')])
+        age_messages(800)
+        ids = list(Message.objects.order_by('id').values_list('id', flat=True))
+        Message.objects.filter(id=ids[0]).update(date=timezone.now() - timedelta(days=1200))
+        archive_messages(older_than_days=365)
+
+    def test_requires_login(self):
+        response = self.client.get(reverse('archived_messages'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_lists_archived_messages_newest_first(self):
+        create_and_login_superuser(self.client)
+        response = self.client.get(reverse('archived_messages'))
+        self.assertEqual([message.name for message in response.context['archived_messages']],
+                         ['Sender 2', 'Sender 1', 'Sender 0'])
+        years = {date.year for date in ArchivedMessage.objects.values_list('date', flat=True)}
+        self.assertEqual(response.context['years'], sorted(years, reverse=True))
+
+    def test_only_years_with_messages_are_listed(self):
+        create_and_login_superuser(self.client)
+        ArchivedMessage.objects.all().delete()
+        for id, year in ((1, 2019), (2, 2022), (3, 2022)):
+            ArchivedMessage.objects.create(id=id, reason='Hiring', name='Sender', email='sender@doe.com',
+                                           message='Hello', date=timezone.make_aware(datetime(year, 6, 1)))
+        with CaptureQueriesContext(connection) as captured:
+            years = self.client.get(reverse('archived_messages')).context['years']
+        self.assertEqual(years, [2022, 2019])
+        # One lookup per listed year, and one more to find there are no earlier ones.
+        lookups = [query for query in captured.captured_queries
+                   if query['sql'].startswith('SELECT "portfolio_archivedmessage"."date" FROM')]
+        self.assertEqual(len(lookups), 3)
+
+    def test_year_filter(self):
+        create_and_login_superuser(self.client)
+        year = ArchivedMessage.objects.get(name='Sender 0').date.year
+        response = self.client.get(reverse('archived_messages'), {'year': year})
+        names = [message.name for message in response.context['archived_messages']]
+        self.assertIn('Sender 0', names)
+        self.assertEqual(response.context['selected_year'], year)
+        self.assertEqual(self.client.get(reverse('archived_messages'), {'year': 'x'}).context['selected_year'], None)
+
+    def test_inbox_links_to_the_archive(self):
+        create_and_login_superuser(self.client)
+        self.assertContains(self.client.get(reverse('received_messages')), reverse('archived_messages'))
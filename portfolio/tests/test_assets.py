@@ -0,0 +1,129 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from ..assets import fetch_vendor_assets, integrity, is_vendored
+from ..storage import minify_css
+
+
+class MinifyCssTests(SimpleTestCase):
+
+    def test_comments_and_whitespace_are_dropped(self):
+        css = '''
+        /* layout */
+        html , body {
+            margin : 0 ;
+            padding: 0;
+        }
+        '''
+        self.assertEqual(minify_css(css), 'html,body{margin : 0;padding: 0}')
+
+    def test_strings_are_left_alone(self):
+        css = 'a::before { content: "  /* kept */ ;  " ; }'
+        self.assertEqual(minify_css(css), 'a::before{content: "  /* kept */ ;  "}')
+
+    def test_descendant_combinators_keep_their_space(self):
+        self.assertEqual(minify_css('.card  .title:hover { color: red }'), '.card .title:hover{color: red}')
+
+
+class TemporaryStaticFilesTestCase(SimpleTestCase):
+    source = None
+    root = None
+    storage = 'portfolio.storage.MinifiedCompressedManifestStaticFilesStorage'
+
+    def setUp(self):
+        self.source = Path(tempfile.mkdtemp())
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.source, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        (self.source / 'css').mkdir()
+        (self.source / 'css' / 'styles.css').write_text(''.join(
+            f'.col-{number} {{\n    width: {number}%;\n}}\n' for number in range(1, 101)))
+        settings_override = override_settings(
+            STATICFILES_DIRS=[str(self.source)], STATIC_ROOT=str(self.root),
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STATICFILES_STORAGE=self.storage)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        is_vendored.cache_clear()
+        self.addCleanup(is_vendored.cache_clear)
+
+    def add_vendor_file(self):
+        (self.source / 'vendor').mkdir()
+        (self.source / 'vendor' / 'bootstrap-4.3.1.min.css').write_text('.btn{display:inline-block}')
+
+
+class StaticBuildTests(TemporaryStaticFilesTestCase):
+
+    def collect(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        return json.loads((self.root / 'staticfiles.json').read_text())['paths']
+
+    def test_collectstatic_minifies_hashes_and_compresses(self):
+        paths = self.collect()
+        hashed = self.root / paths['css/styles.css']
+        self.assertNotEqual(paths['css/styles.css'], 'css/styles.css')
+        self.assertTrue(hashed.read_text().startswith('.col-1{width: 1%}.col-2{width: 2%}'))
+        self.assertTrue(Path(f'{hashed}.gz').exists())
+
+    def test_vendored_files_are_served_with_immutable_cache_headers(self):
+        self.add_vendor_file()
+        paths = self.collect()
+        response = self.client.get(f'/static/{paths["vendor/bootstrap-4.3.1.min.css"]}')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+
+
+class VendorAssetTagTests(TemporaryStaticFilesTestCase):
+    storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+    template = Template("{% load assets %}{% vendor_stylesheet 'bootstrap.css' %}{% vendor_script 'jquery.js' %}")
+
+    def test_falls_back_to_the_cdn_until_vendored(self):
+        html = self.template.render(Context())
+        self.assertIn('href="https://stackpath.bootstrapcdn.com/bootstrap/4.3.1/css/bootstrap.min.css" integrity=',
+                      html)
+        self.assertIn('src="https://code.jquery.com/jquery-3.3.1.slim.min.js" integrity=', html)
+
+    def test_uses_the_local_copy_once_vendored(self):
+        self.add_vendor_file()
+        html = self.template.render(Context())
+        self.assertIn('<link rel="stylesheet" href="/static/vendor/bootstrap-4.3.1.min.css">', html)
+        self.assertIn('https://code.jquery.com/', html)
+
+    @override_settings(STATICFILES_STORAGE='portfolio.storage.MinifiedCompressedManifestStaticFilesStorage')
+    def test_vendored_file_missing_from_the_manifest_falls_back_to_the_cdn(self):
+        self.add_vendor_file()
+        html = self.template.render(Context())
+        self.assertIn('href="https://stackpath.bootstrapcdn.com/', html)
+
+
+class FetchVendorAssetsTests(SimpleTestCase):
+    directory = None
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def fetch(self, content, pinned):
+        assets = {'library.js': {'path': 'vendor/library.js', 'url': 'https://cdn.example.com/library.js',
+                                 'integrity': integrity(pinned)}}
+        response = mock.MagicMock()
+        response.__enter__.return_value.read.return_value = content
+        with mock.patch.dict('portfolio.assets.VENDOR_ASSETS', assets, clear=True), \
+                mock.patch('portfolio.assets.urlopen', return_value=response):
+            return fetch_vendor_assets(self.directory)
+
+    def test_matching_download_is_written(self):
+        self.assertEqual(self.fetch(b'library()', b'library()'), ['vendor/library.js'])
+        self.assertEqual((self.directory / 'vendor' / 'library.js').read_bytes(), b'library()')
+        self.assertEqual(self.fetch(b'library()', b'library()'), [])
+
+    def test_tampered_download_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.fetch(b'evil()', b'library()')
+        self.assertFalse((self.directory / 'vendor' / 'library.js').exists())
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+from .. import async_views, views
+from .utils import create_pastwork
+
+
+@override_settings(ROOT_URLCONF='portfolio_project.asgi_urls')
+class AsyncReadOnlyViewTests(TransactionTestCase):
+    pastwork = None
+
+    def setUp(self):
+        self.pastwork = create_pastwork()
+
+    def test_read_only_pages_resolve_to_async_views(self):
+        self.assertIs(resolve(reverse('home')).func, async_views.home)
+        self.assertIs(resolve(reverse('pastworks')).func, async_views.pastworks)
+        self.assertIs(resolve(reverse('pastwork', args=[self.pastwork.pk])).func, async_views.pastwork)
+        self.assertIs(async_views.pastworks.view_class, views.PastWorksView)
+
+    def test_other_pages_keep_their_views(self):
+        self.assertEqual(resolve(reverse('send_message')).func.view_class, views.SendMessageView)
+
+    async def test_home_page(self):
+        response = await self.async_client.get(reverse('home'))
+        self.assertContains(response, 'My portfolio app')
+        self.assertContains(response, 'csrfmiddlewaretoken')
+
+    async def test_pastworks_page(self):
+        response = await self.async_client.get(reverse('pastworks'))
+        self.assertContains(response, 'My portfolio app')
+
+    async def test_pastwork_page(self):
+        response = await self.async_client.get(reverse('pastwork', args=[self.pastwork.pk]))
+        self.assertContains(response, 'My portfolio app')
+        missing = await self.async_client.get(reverse('pastwork', args=[self.pastwork.pk + 1]))
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_static_files_are_served_in_the_async_chain(self):
+        response = await self.async_client.get('/static/css/styles.css')
+        self.assertEqual(response.status_code, 200)
+
+    async def test_slow_pages_do_not_wait_for_each_other(self):
+        original = views.PastWorkView.get_object
+
+        def slow_get_object(view, queryset=None):
+            time.sleep(0.3)
+            return original(view, queryset)
+
+        url = reverse('pastwork', args=[self.pastwork.pk])
+        with mock.patch.object(views.PastWorkView, 'get_object', slow_get_object):
+            start = time.perf_counter()
+            responses = await asyncio.gather(*(self.async_client.get(url) for _ in range(3)))
+            elapsed = time.perf_counter() - start
+        self.assertEqual([response.status_code for response in responses], [200] * 3)
+        self.assertLess(elapsed, 0.8)
+
+
+class BenchmarkAsgiCommandTests(TransactionTestCase):
+
+    def test_reports_both_paths_as_json(self):
+        output = StringIO()
+        call_command('benchmark_asgi', pastworks=3, concurrency=4, requests=6, workers=2, client_delay=0.01,
+                     stdout=output)
+        report = json.loads(output.getvalue())
+        for interface in ('wsgi', 'asgi'):
+            self.assertEqual(report[interface]['errors'], 0)
+            self.assertGreater(report[interface]['requests_per_second'], 0)
+            self.assertIn('p99_ms', report[interface])
@@ -0,0 +1,46 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from .. import urls
+
+
+class BenchmarkRoutesCommandTests(TestCase):
+
+    def test_reports_every_named_route_as_json(self):
+        output = StringIO()
+        call_command('benchmark_routes', pastworks=5, messages=10, iterations=3, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(set(report['routes']), {pattern.name for pattern in urls.urlpatterns})
+        home = report['routes']['home']
+        self.assertEqual(home['status'], 200)
+        self.assertLessEqual(home['p50_ms'], home['p99_ms'])
+        self.assertIn('queries', home)
+        self.assertIn('peak_memory_kb', home)
+
+    def test_route_selection(self):
+        output = StringIO()
+        call_command('benchmark_routes', pastworks=3, messages=3, iterations=2,
+                     routes=['pastworks', 'received_messages'], stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(set(report['routes']), {'pastworks', 'received_messages'})
+        self.assertEqual(report['routes']['received_messages']['status'], 200)
+
+    def run_home(self):
+        output = StringIO()
+        call_command('benchmark_routes', pastworks=1, messages=1, iterations=2, routes=['home'], stdout=output)
+        return json.loads(output.getvalue())['routes']['home']
+
+    @override_settings(SECURE_SSL_REDIRECT=True)
+    def test_pages_are_requested_over_https(self):
+        home = self.run_home()
+        self.assertEqual(home['status'], 200)
+        self.assertNotIn('error', home)
+
+    @override_settings(PREPEND_WWW=True)
+    def test_redirect_is_reported_as_an_error(self):
+        home = self.run_home()
+        self.assertEqual(home['status'], 301)
+        self.assertEqual(home['error'], 'HTTP 301 Moved Permanently')
+        self.assertNotIn('p50_ms', home)
@@ -0,0 +1,47 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+from ..startup import project_template_names, warm_templates
+
+CACHED_TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': engines['django'].engine.dirs,
+    'OPTIONS': {
+        'loaders': [('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ])],
+    },
+}]
+
+
+class WarmTemplatesTests(SimpleTestCase):
+
+    def test_project_templates_are_listed_by_name(self):
+        names = project_template_names()
+        self.assertIn('home.html', names)
+        self.assertIn('navbar_.html', names)
+
+    @override_settings(TEMPLATES=CACHED_TEMPLATES)
+    def test_cached_loader_keeps_every_warmed_template(self):
+        self.assertEqual(warm_templates(), len(project_template_names()))
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertIn('home.html', loader.get_template_cache)
+
+
+class BenchmarkStartupCommandTests(SimpleTestCase):
+
+    def test_reports_every_mode_as_json(self):
+        output = StringIO()
+        call_command('benchmark_startup', runs=1, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(set(report['modes']), {'uncached', 'cached', 'warmed'})
+        self.assertIn('p50_ms', report['modes']['warmed']['first_request_ms'])
+        self.assertEqual(report['modes']['warmed']['status'], [200])
+
+    def test_probe_refuses_to_time_anything_but_a_page(self):
+        with self.assertRaisesMessage(CommandError, '/no-such-page answered 404'):
+            call_command('benchmark_startup', runs=1, url='/no-such-page', stdout=StringIO())
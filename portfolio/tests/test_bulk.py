@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from ..bulk import export_chunks, import_pastworks, read_rows
+from ..cache import get_content_versions
+from ..models import Message, PastWork, Reason
+from ..search import get_search_backend
+from .utils import create_and_login_superuser, create_messages, create_pastwork, create_pastworks
+
+ROWS = [
+    {'name': 'Blog', 'description': 'A blog', 'tools_used': 'Django, Docker', 'github_link': 'https://github.com/blog'},
+    {'name': 'Shop', 'description': 'A shop', 'github_link': 'https://github.com/shop',
+     'page_link': 'https://shop.com'},
+]
+
+
+class ImportPastWorksTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_creates_new_past_works(self):
+        result = import_pastworks(ROWS)
+        self.assertEqual(result, {'created': 2, 'updated': 0, 'errors': []})
+        shop = PastWork.objects.get(name='Shop')
+        self.assertIsNone(shop.motivation)
+        self.assertEqual(shop.page_link, 'https://shop.com')
+
+    def test_updates_on_name_or_github_link(self):
+        create_pastwork(name='Blog', github_link='https://github.com/old-blog')
+        create_pastwork(name='Old shop', github_link='https://github.com/shop')
+        result = import_pastworks(ROWS)
+        self.assertEqual((result['created'], result['updated']), (0, 2))
+        self.assertEqual(PastWork.objects.get(name='Blog').github_link, 'https://github.com/blog')
+        self.assertTrue(PastWork.objects.filter(name='Shop', description='A shop').exists())
+        self.assertEqual(PastWork.objects.count(), 2)
+
+    def test_invalid_rows_are_skipped(self):
+        create_pastwork(name='Blog', github_link='https://github.com/one')
+        create_pastwork(name='Other', github_link='https://github.com/blog')
+        rows = ROWS + [
+            {'name': 'Broken', 'description': 'No link', 'github_link': 'not a url'},
+            {'name': 'Shop', 'description': 'Again', 'github_link': 'https://github.com/shop-again'},
+        ]
+        result = import_pastworks(rows, batch_size=10)
+        self.assertEqual((result['created'], result['updated']), (1, 0))
+        self.assertEqual([number for number, _ in result['errors']], [1, 3, 4])
+        self.assertIn('github_link', result['errors'][1][1])
+        self.assertIn('row 2', result['errors'][2][1])
+
+    def test_keeps_tools_search_and_cache_versions_current(self):
+        version = get_content_versions(PastWork)
+        import_pastworks(ROWS)
+        self.assertNotEqual(get_content_versions(PastWork), version)
+        blog = PastWork.objects.get(name='Blog')
+        self.assertEqual(sorted(blog.tools.values_list('slug', flat=True)), ['django', 'docker'])
+        self.assertEqual([pastwork.name for pastwork in get_search_backend().search('blog', 10)], ['Blog'])
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        rows = [{'name': f'Project {number}', 'description': 'Bulk', 'github_link': f'https://github.com/{number}'}
+                for number in range(50)]
+        with self.assertNumQueries(8):
+            import_pastworks(rows, batch_size=50)
+        self.assertEqual(PastWork.objects.count(), 50)
+
+
+class ExportTests(TestCase):
+
+    def test_messages_as_csv(self):
+        create_messages(3, [Reason.objects.create(purpose='Hiring')])
+        rows = list(csv.reader(io.StringIO(''.join(export_chunks(Message.objects.all(), 'csv', chunk_size=2)))))
+        self.assertEqual(rows[0], ['id', 'reason', 'name', 'email', 'message', 'date'])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[1][1:4], ['Hiring', 'Sender 0', 'sender0@doe.com'])
+
+    def test_pastworks_round_trip_through_json(self):
+        create_pastworks(3)
+        exported = json.loads(''.join(export_chunks(PastWork.objects.all(), 'json')))
+        self.assertEqual(len(exported), 3)
+        exported[0]['description'] = 'Changed'
+        result = import_pastworks(read_rows(io.StringIO(json.dumps(exported)), 'json'))
+        self.assertEqual((result['created'], result['updated']), (0, 3))
+        self.assertTrue(PastWork.objects.filter(name='Project 0', description='Changed').exists())
+
+    def test_empty_json_export(self):
+        self.assertEqual(json.loads(''.join(export_chunks(PastWork.objects.all(), 'json'))), [])
+
+
+class BulkCommandTests(TestCase):
+    directory = None
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def test_import_and_export_files(self):
+        source = self.directory / 'pastworks.json'
+        source.write_text(json.dumps(ROWS))
+        output = io.StringIO()
+        call_command('import_pastworks', str(source), stdout=output)
+        self.assertIn('Created 2, updated 0 and skipped 0', output.getvalue())
+
+        destination = self.directory / 'export.csv'
+        call_command('export_records', 'pastworks', output=str(destination))
+        rows = list(csv.DictReader(destination.open()))
+        self.assertEqual([row['name'] for row in rows], ['Blog', 'Shop'])
+
+    def test_export_to_stdout(self):
+        create_messages(2, [Reason.objects.create(purpose='Hiring')])
+        output = io.StringIO()
+        call_command('export_records', 'messages', format='json', stdout=output)
+        self.assertEqual(len(json.loads(output.getvalue())), 2)
+
+
+class BulkAdminTests(TestCase):
+
+    def setUp(self):
+        create_and_login_superuser(self.client)
+
+    def test_export_action_streams_the_selection(self):
+        create_messages(3, [Reason.objects.create(purpose='Hiring')])
+        ids = list(Message.objects.values_list('pk', flat=True))[:2]
+        response = self.client.post(reverse('admin:portfolio_message_changelist'),
+                                    {'action': 'export_csv', '_selected_action': ids})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('messages.csv', response['Content-Disposition'])
+        self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 3)
+
+    def test_import_view(self):
+        upload = SimpleUploadedFile('pastworks.csv', (
+            'name,description,github_link\n'
+            'Blog,A blog,https://github.com/blog\n'
+            'Broken,No link,nope\n').encode())
+        response = self.client.post(reverse('admin:portfolio_pastwork_import'), {'file': upload}, follow=True)
+        self.assertContains(response, 'Created 1 and updated 0 past work(s).')
+        self.assertContains(response, 'Row 2 was skipped')
+        self.assertTrue(PastWork.objects.filter(name='Blog').exists())
+
+    def test_unreadable_upload(self):
+        upload = SimpleUploadedFile('pastworks.json', b'{not json')
+        response = self.client.post(reverse('admin:portfolio_pastwork_import'), {'file': upload})
+        self.assertContains(response, 'The file could not be read')
+
+    def test_change_list_links_to_the_import(self):
+        response = self.client.get(reverse('admin:portfolio_pastwork_changelist'))
+        self.assertContains(response, reverse('admin:portfolio_pastwork_import'))
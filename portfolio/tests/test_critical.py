@@ -0,0 +1,148 @@
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, override_settings
+from ..critical import critical_css, critical_rules, render_blocking, used_selectors
+from .test_assets import TemporaryStaticFilesTestCase
+
+BOOTSTRAP = '''
+:root { --blue: #007bff; }
+.navbar { display: flex; }
+.navbar-brand:hover { color: #fff; }
+.modal { display: none; }
+.modal .close { float: right; }
+.alert-dismissible .close { padding: .75rem; }
+@font-face { font-family: Icons; src: url(icons.woff); }
+@media (min-width: 576px) {
+  .container { max-width: 540px; }
+  .modal-dialog { margin: 1.75rem auto; }
+}
+@media print { .navbar { display: none; } }
+'''
+
+
+class CriticalRulesTests(SimpleTestCase):
+    used = used_selectors('<nav class="navbar" id="top"><a class="navbar-brand">Name</a></nav>'
+                          '<div class="container"><button class="close">x</button></div>')
+
+    def test_keeps_rules_for_elements_on_the_page(self):
+        css = critical_rules(BOOTSTRAP, self.used)
+        self.assertIn(':root{--blue: #007bff}', css)
+        self.assertIn('.navbar{display: flex}', css)
+        self.assertIn('.navbar-brand:hover{color: #fff}', css)
+        self.assertIn('@media (min-width: 576px){.container{max-width: 540px}}', css)
+
+    def test_drops_everything_else(self):
+        css = critical_rules(BOOTSTRAP, self.used)
+        self.assertNotIn('modal', css)
+        self.assertNotIn('@font-face', css)
+        self.assertNotIn('display: none', css)
+
+    def test_ids_and_grouped_selectors(self):
+        self.assertEqual(critical_rules('#top,.missing{top:0}#gone{top:0}', self.used), '#top,.missing{top:0}')
+
+
+class RenderBlockingTests(SimpleTestCase):
+
+    def test_counts_head_stylesheets_inline_css_and_plain_scripts(self):
+        html = '''<html><head><style>.a{top:0}</style>
+        <link rel="stylesheet" href="https://cdn.example.com/site.css">
+        <link rel="preload" href="/static/late.css" as="style">
+        <link rel="stylesheet" href="/static/print.css" media="print">
+        </head><body>
+        <script src="https://cdn.example.com/blocking.js"></script>
+        <script src="https://cdn.example.com/deferred.js" defer></script>
+        </body></html>'''
+        report = render_blocking(html)
+        self.assertEqual(report['blocking_requests'], 2)
+        self.assertEqual(report['inline_css_bytes'], 9)
+        self.assertEqual(report['blocking_bytes'], 9)
+        self.assertEqual(report['external'], ['https://cdn.example.com/blocking.js',
+                                              'https://cdn.example.com/site.css'])
+
+
+class CriticalCssBuildTests(TemporaryStaticFilesTestCase):
+    storage = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+
+    def setUp(self):
+        super().setUp()
+        (self.source / 'css' / 'styles.css').write_text('.footer{height:60px}.unused{color:red}')
+        critical_css.cache_clear()
+        self.addCleanup(critical_css.cache_clear)
+
+    def add_vendor_file(self):
+        (self.source / 'vendor').mkdir()
+        (self.source / 'vendor' / 'bootstrap-4.3.1.min.css').write_text(BOOTSTRAP)
+
+    def build(self):
+        output = StringIO()
+        call_command('build_critical_css', stdout=output)
+        critical_css.cache_clear()
+        return (self.source / 'css' / 'critical.css').read_text()
+
+    def test_writes_the_rules_the_home_page_uses(self):
+        self.add_vendor_file()
+        css = self.build()
+        self.assertTrue(css.startswith('.footer{height:60px}'))
+        self.assertIn('.navbar{display: flex}', css)
+        # The alert's close button only shows with a message.
+        self.assertIn('.alert-dismissible .close{padding: .75rem}', css)
+        self.assertNotIn('.unused', css)
+        self.assertNotIn('.modal{', css)
+
+    def test_needs_the_vendored_bootstrap(self):
+        with self.assertRaisesMessage(CommandError, 'vendor_assets'):
+            call_command('build_critical_css', stdout=StringIO())
+
+    def test_base_inlines_the_critical_css_and_defers_the_stylesheets(self):
+        self.add_vendor_file()
+        self.build()
+        html = render_to_string('base.html')
+        self.assertIn('<style>.footer{height:60px}', html)
+        self.assertIn('<link rel="preload" href="/static/css/styles.css" as="style"', html)
+        self.assertIn('<noscript><link rel="stylesheet" href="/static/vendor/bootstrap-4.3.1.min.css"></noscript>',
+                      html)
+        self.assertEqual(render_blocking(html)['blocking_requests'], 0)
+
+    def test_stylesheets_block_until_the_critical_css_is_built(self):
+        html = render_to_string('base.html')
+        self.assertNotIn('<style>', html)
+        self.assertIn('<link rel="stylesheet" href="/static/css/styles.css">', html)
+        self.assertIn('defer></script>', html)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class CheckRenderBlockingCommandTests(TestCase):
+
+    def check(self, routes=('home', 'pastworks', 'received_messages'), **options):
+        output = StringIO()
+        call_command('check_render_blocking', pastworks=3, messages=3, routes=list(routes), stdout=output,
+                     **options)
+        return json.loads(output.getvalue())
+
+    def test_reports_each_page_template(self):
+        report = self.check()
+        self.assertEqual(set(report['templates']), {'home.html', 'pastworks.html', 'messages_received.html'})
+        home = report['templates']['home.html']
+        self.assertEqual(home['routes'], ['home'])
+        self.assertGreater(home['blocking_bytes'], 0)
+
+    def test_budget(self):
+        with self.assertRaisesMessage(CommandError, 'home.html'):
+            self.check(budget=1)
+
+    @override_settings(SECURE_SSL_REDIRECT=True)
+    def test_pages_are_requested_over_https(self):
+        with self.assertRaisesMessage(CommandError, 'home.html'):
+            self.check(budget=1)
+
+    def test_selected_route_without_a_page_fails(self):
+        with self.assertRaisesMessage(CommandError, 'No page to check for: api_abouts'):
+            self.check(routes=['home', 'api_abouts'])
+
+    @override_settings(PREPEND_WWW=True)
+    def test_nothing_checked_fails_even_within_the_budget(self):
+        with self.assertRaisesMessage(CommandError, 'No page template was checked'):
+            self.check(budget=10 ** 9)
@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import Error, connection
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ..db import check_connections, pool_stats
+
+
+class ConnectionHealthCheckTests(SimpleTestCase):
+    """Persistent connections to a throwaway sqlite file, standing in for the production database."""
+    handler = None
+
+    def setUp(self):
+        descriptor, path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(descriptor)
+        self.addCleanup(os.remove, path)
+        self.handler = ConnectionHandler({
+            'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path, 'CONN_MAX_AGE': 60},
+            'per_request': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': path},
+        })
+        self.addCleanup(self.handler.close_all)
+        self.query()
+
+    def query(self, alias='default'):
+        with self.handler[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            return cursor.fetchone()
+
+    def drop_connection(self):
+        # What the connection looks like to Django once the server has gone away.
+        self.handler['default'].connection.close()
+
+    def test_dropped_connection_fails_without_a_check(self):
+        self.drop_connection()
+        with self.assertRaises(Error):
+            self.query()
+
+    def test_dropped_connection_is_replaced_before_its_first_query(self):
+        opened = pool_stats()['opened']
+        self.drop_connection()
+        check_connections(self.handler, interval=0)
+        with self.assertLogs('portfolio.db', 'WARNING') as logs:
+            self.assertEqual(self.query(), (1,))
+        self.assertIn('stale_connection', logs.output[0])
+        self.assertEqual(pool_stats()['opened'], opened + 1)
+
+    def test_healthy_connection_is_kept(self):
+        connection = self.handler['default'].connection
+        checked = pool_stats()['checked']
+        check_connections(self.handler, interval=0)
+        self.query()
+        self.assertIs(self.handler['default'].connection, connection)
+        self.assertEqual(pool_stats()['checked'], checked + 1)
+
+    def test_check_waits_for_the_first_query_and_is_counted(self):
+        checked = pool_stats()['checked']
+        check_connections(self.handler, interval=0)
+        self.assertEqual(pool_stats()['checked'], checked)
+        executed = []
+
+        def record(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        with self.handler['default'].execute_wrapper(record):
+            self.query()
+            self.query()
+        self.assertEqual(executed, ['SELECT 1'] * 3)
+        self.assertEqual(pool_stats()['checked'], checked + 1)
+
+    def test_recently_checked_connection_is_trusted(self):
+        checked = pool_stats()['checked']
+        check_connections(self.handler, interval=60)
+        self.query()
+        self.assertEqual(pool_stats()['checked'], checked)
+
+    def test_connection_closed_after_each_request_is_not_checked(self):
+        self.query('per_request')
+        checked = pool_stats()['checked']
+        check_connections(self.handler, interval=0)
+        self.query('per_request')
+        self.assertEqual(pool_stats()['checked'], checked)
+
+    def test_closed_connection_is_left_alone(self):
+        self.handler['default'].close()
+        reused = pool_stats()['reused']
+        check_connections(self.handler, interval=0)
+        self.assertEqual(pool_stats()['reused'], reused)
+
+
+class RequestStartedHealthCheckTests(TransactionTestCase):
+    """Outside a test transaction, where the check would be skipped."""
+
+    def test_every_request_checks_the_connections(self):
+        with mock.patch('portfolio.db.check_connections') as check:
+            self.client.get(reverse('api_abouts'))
+        check.assert_called_once_with()
+
+    def persistent_connection(self):
+        return mock.patch.dict(connection.settings_dict, CONN_MAX_AGE=60)
+
+    def test_request_that_queries_runs_the_check_first(self):
+        self.client.get(reverse('api_abouts'))
+        with self.persistent_connection(), CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse('api_abouts'), HTTP_CACHE_CONTROL='no-cache')
+        self.assertEqual([query['sql'] for query in captured.captured_queries][:1], ['SELECT 1'])
+        self.assertEqual(len(captured.captured_queries), 2)
+
+    def test_request_served_without_the_database_runs_no_check(self):
+        cache.clear()
+        self.client.get(reverse('home'))
+        with self.persistent_connection(), self.assertNumQueries(0):
+            self.client.get(reverse('home'))
+
+    @override_settings(REQUEST_METRICS_ENABLED=True)
+    def test_check_is_counted_in_the_request_metrics(self):
+        with self.persistent_connection(), self.assertLogs('portfolio.metrics', 'INFO') as logs:
+            self.client.get(reverse('api_abouts'), HTTP_CACHE_CONTROL='no-cache')
+        self.assertEqual(json.loads(logs.records[0].getMessage())['queries'], 2)
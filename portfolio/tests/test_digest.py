@@ -0,0 +1,136 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from ..digest import claim_messages, digest_due, queue_digest
+from ..models import Message, OutboxEmail, Reason
+from ..spam import form_timestamp
+from .utils import create_messages
+
+
+@override_settings(MESSAGE_NOTIFICATIONS='digest', MESSAGE_DIGEST_SIZE=5, MESSAGE_DIGEST_MINUTES=30,
+                   EMAIL_RECEIVER='dele@example.com')
+class MessageDigestTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.hiring = Reason.objects.create(purpose='Hiring')
+        self.freelance = Reason.objects.create(purpose='Freelance')
+
+    def send(self, number, reason):
+        return self.client.post(reverse('send_message'), {'reason': reason.id, 'name': f'Sender {number}',
+                                                          'email': f'sender{number}@doe.com',
+                                                          'message': f'Message number {number}',
+                                                          'rendered_at': form_timestamp()})
+
+    def test_send_message_waits_for_the_digest(self):
+        self.send(0, self.hiring)
+        with self.assertNumQueries(1) as captured:
+            self.send(1, self.hiring)
+        self.assertTrue(captured.captured_queries[0]['sql'].startswith('INSERT INTO "portfolio_message"'))
+        self.assertFalse(Message.objects.filter(notified=True).exists())
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_no_digest_until_enough_messages_or_the_oldest_is_old_enough(self):
+        create_messages(4, [self.hiring], notified=False)
+        self.assertIsNone(queue_digest())
+        self.assertIsNotNone(queue_digest(now=timezone.now() + timedelta(minutes=31)))
+
+        create_messages(5, [self.hiring], notified=False)
+        self.assertIsNotNone(queue_digest())
+
+    def test_digest_groups_messages_by_reason(self):
+        create_messages(3, [self.hiring, self.freelance], notified=False)
+        email = queue_digest(force=True)
+        self.assertEqual(email.subject, '3 new messages from Portfolio App')
+        self.assertEqual(email.recipient_list(), ['dele@example.com'])
+        freelance, hiring = email.body.split('\n\n\n')
+        self.assertTrue(freelance.startswith('Freelance (1)'))
+        self.assertIn('Sender 1 <sender1@doe.com>', freelance)
+        self.assertTrue(hiring.startswith('Hiring (2)'))
+        self.assertLess(hiring.index('Sender 0'), hiring.index('Sender 2'))
+
+    def test_each_message_goes_out_once(self):
+        create_messages(3, [self.hiring], notified=False)
+        queue_digest(force=True)
+        self.assertFalse(Message.objects.filter(notified=False).exists())
+        self.assertIsNone(queue_digest(force=True))
+        create_messages(1, [self.hiring], notified=False)
+        self.assertIn('1 new message from', queue_digest(force=True).subject)
+
+    def overlapping_run(self):
+        """Patch digest_due so another run reads, claims and queues the same rows before this one claims them."""
+        other = []
+
+        def due_after_another_run(batch, force, now):
+            if not other:
+                with mock.patch('portfolio.digest.digest_due', digest_due):
+                    other.append(queue_digest(force=True))
+            return digest_due(batch, force, now)
+
+        return other, mock.patch('portfolio.digest.digest_due', due_after_another_run)
+
+    def test_overlapping_runs_never_send_a_message_twice(self):
+        create_messages(4, [self.hiring], notified=False)
+        other, overlapping = self.overlapping_run()
+        with overlapping:
+            email = queue_digest(force=True)
+        self.assertIn('4 new messages', other[0].subject)
+        self.assertIsNone(email)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+        self.assertFalse(Message.objects.filter(notified=False).exists())
+
+    def test_digest_only_covers_the_messages_this_run_claimed(self):
+        create_messages(2, [self.hiring], notified=False)
+        read = list(Message.objects.select_related('reason'))
+        Message.objects.filter(id=read[0].id).update(notified=True)
+        self.assertEqual(claim_messages(read), read[1:])
+
+    def test_queueing_a_digest_reads_once_and_claims_with_updates_only(self):
+        create_messages(1, [self.hiring], notified=False)
+        queue_digest(force=True)
+        create_messages(20, [self.hiring, self.freelance], notified=False)
+        with CaptureQueriesContext(connection) as captured:
+            queue_digest(force=True)
+        statements = [query['sql'].split()[0] for query in captured.captured_queries]
+        claims = 1 if connection.features.has_select_for_update_skip_locked else 20
+        self.assertEqual(statements, ['SAVEPOINT', 'SELECT'] + ['UPDATE'] * claims + ['INSERT', 'RELEASE'])
+
+    @override_settings(MESSAGE_DIGEST_MAX_MESSAGES=4)
+    def test_command_sends_digests_over_one_connection(self):
+        create_messages(10, [self.hiring], notified=False)
+        output = StringIO()
+        call_command('send_message_digest', stdout=output)
+        self.assertIn('Queued 2 digest(s), processed 2 outbox email(s)', output.getvalue())
+        self.assertEqual([email.subject for email in mail.outbox],
+                         ['4 new messages from Portfolio App', '4 new messages from Portfolio App'])
+        self.assertEqual(Message.objects.filter(notified=False).count(), 2)
+        call_command('send_message_digest', force=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(Message.objects.filter(notified=False).exists())
+
+    def test_command_can_leave_digests_to_the_outbox_worker(self):
+        create_messages(5, [self.hiring], notified=False)
+        call_command('send_message_digest', queue_only=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.PENDING)
+
+
+class EachMessageNotificationTests(TestCase):
+
+    def test_messages_emailed_on_their_own_are_left_out_of_digests(self):
+        cache.clear()
+        reason = Reason.objects.create(purpose='Hiring')
+        self.client.post(reverse('send_message'), {'reason': reason.id, 'name': 'Jane Doe',
+                                                   'email': 'jane@doe.com', 'message': 'Hey Dele',
+                                                   'rendered_at': form_timestamp()})
+        self.assertTrue(Message.objects.get().notified)
+        self.assertIsNone(queue_digest(force=True))
@@ -1,7 +1,12 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, resolve
-from .utils import create_pastwork, create_and_login_superuser
+from .utils import create_pastwork, create_and_login_superuser, create_skill
 from .. import views
+from ..cache import CSRF_TOKEN_PLACEHOLDER
+from ..models import Reason
 
 
 class HomepageTests(TestCase):
@@ -30,6 +35,12 @@ class HomepageTests(TestCase):
         self.assertNotContains(self.response, 'Add New Skill')
         self.assertNotContains(self.response, 'See More Side Projects That I\'ve Done Here...')
 
+    def test_see_more_link_starts_after_the_listed_past_works(self):
+        create_pastwork(name='Blog', github_link='https://github.com/blog')
+        create_pastwork(name='Shop', github_link='https://github.com/shop')
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, f'?after={response.context["pastworks"].next_cursor}')
+
     def test_homepage_url_resolves_homepageview(self):
         view = resolve('/')
         self.assertEqual(
@@ -48,4 +59,84 @@ class HomepageTestsForSuperUser(TestCase):
 
     def test_homepage_contains_correct_html(self):
         self.assertContains(self.response, 'Add New "About Me"')
-        self.assertContains(self.response, 'Add New Skill')
\ No newline at end of file
+        self.assertContains(self.response, 'Add New Skill')
+
+
+class HomepageCacheTests(TestCase):
+    url = None
+
+    def setUp(self):
+        cache.clear()
+        create_pastwork()
+        self.url = reverse('home')
+        self.client.get(self.url)
+
+    def test_warm_hit_skips_the_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'My portfolio app')
+
+    def test_unread_query_parameters_share_the_cached_page(self):
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {'x': 'random-1'})
+            self.client.get(self.url, {'utm_source': 'mail', 'x': 'random-2'})
+
+    def test_listed_query_parameters_get_their_own_copy(self):
+        view = views.HomePageView(cache_query_params=('lang',))
+        request = RequestFactory().get(self.url, {'x': '1', 'lang': 'fr'})
+        self.assertEqual(view.page_cache_path(request), f'{self.url}?lang=fr')
+        self.assertEqual(view.page_cache_path(RequestFactory().get(self.url, {'x': '1'})), self.url)
+
+    def test_cached_page_carries_a_real_csrf_token(self):
+        response = self.client.get(self.url)
+        self.assertNotContains(response, CSRF_TOKEN_PLACEHOLDER)
+        self.assertContains(response, 'csrfmiddlewaretoken')
+
+    def test_saving_a_model_invalidates_the_page(self):
+        create_skill()
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, 'home.html')
+        self.assertContains(response, 'Development and Source Control')
+
+    def test_superusers_are_not_served_the_cached_page(self):
+        create_and_login_superuser(self.client)
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, 'home.html')
+        self.assertContains(response, 'Add New Skill')
+
+
+class HomepageFragmentCacheTests(TestCase):
+    url = None
+
+    def setUp(self):
+        cache.clear()
+        create_pastwork()
+        Reason.objects.create(purpose='Hiring')
+        create_and_login_superuser(self.client)
+        self.url = reverse('home')
+        self.client.get(self.url)
+
+    def test_cached_fragments_skip_their_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        tables = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('portfolio_pastwork', tables)
+        self.assertNotIn('portfolio_reason', tables)
+        self.assertContains(response, 'My portfolio app')
+        self.assertContains(response, 'Hiring')
+
+    def test_superuser_and_anonymous_fragments_are_kept_apart(self):
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertContains(response, 'My portfolio app')
+        self.assertNotContains(response, 'Add Past Work')
+
+    def test_saving_a_past_work_refreshes_its_fragment(self):
+        create_pastwork(name='Blog', github_link='https://github.com/blog')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Blog')
+
+    def test_saving_a_reason_refreshes_its_fragment(self):
+        Reason.objects.create(purpose='Saying hi')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'Saying hi')
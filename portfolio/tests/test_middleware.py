@@ -0,0 +1,45 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from .utils import create_pastwork
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True)
+class RequestMetricsMiddlewareTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        create_pastwork()
+
+    def test_server_timing_header(self):
+        with self.assertLogs('portfolio.metrics', 'INFO'):
+            response = self.client.get(reverse('pastworks'))
+        self.assertIn('total;dur=', response['Server-Timing'])
+        self.assertIn('sql;dur=', response['Server-Timing'])
+        self.assertRegex(response['Server-Timing'], r'desc="\d+ queries"')
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+    def test_structured_log_line(self):
+        with self.assertLogs('portfolio.metrics', 'INFO') as logs:
+            self.client.get(reverse('home'))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record['view'], 'HomePageView')
+        self.assertEqual(record['status'], 200)
+        self.assertGreater(record['queries'], 0)
+        self.assertGreater(record['render_ms'], 0)
+        self.assertFalse(record['over_query_budget'])
+
+    @override_settings(REQUEST_QUERY_BUDGET=1)
+    def test_views_over_the_query_budget_are_flagged(self):
+        with self.assertLogs('portfolio.metrics', 'WARNING') as logs:
+            self.client.get(reverse('pastworks'))
+        self.assertTrue(json.loads(logs.records[0].getMessage())['over_query_budget'])
+
+
+class RequestMetricsDisabledTests(TestCase):
+
+    def test_no_header_when_disabled(self):
+        response = self.client.get(reverse('pastworks'))
+        self.assertNotIn('Server-Timing', response)
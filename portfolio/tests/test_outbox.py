@@ -0,0 +1,59 @@
+from io import StringIO
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ..models import Message, OutboxEmail
+from ..spam import form_timestamp
+from .utils import create_reason
+
+
+class OutboxTests(TestCase):
+    reason = None
+
+    def setUp(self):
+        cache.clear()
+        self.reason = create_reason()
+        self.client.post(reverse('send_message'), {'reason': self.reason.id,
+                                                   'name': 'Jane Doe',
+                                                   'email': 'jane@doe.com',
+                                                   'message': 'Hey Dele',
+                                                   'rendered_at': form_timestamp()})
+
+    def test_send_message_queues_email_instead_of_sending_it(self):
+        self.assertEqual(Message.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.PENDING)
+        self.assertIn('Jane Doe says I want to hire you', email.body)
+
+    def test_process_outbox_sends_pending_emails(self):
+        call_command('process_outbox', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Message from Portfolio App')
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.SENT)
+        self.assertIsNotNone(email.date_sent)
+
+    def test_sent_emails_are_not_sent_again(self):
+        call_command('process_outbox', stdout=StringIO())
+        call_command('process_outbox', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(EMAIL_BACKEND='portfolio.tests.utils.FailingEmailBackend')
+    def test_failed_delivery_is_retried_later(self):
+        with self.assertLogs('portfolio.outbox', 'WARNING'):
+            call_command('process_outbox', stdout=StringIO())
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertEqual(email.last_error, 'Mail relay unavailable')
+        self.assertGreater(email.next_attempt_at, email.date_created)
+
+    @override_settings(EMAIL_BACKEND='portfolio.tests.utils.FailingEmailBackend', OUTBOX_MAX_ATTEMPTS=1)
+    def test_delivery_gives_up_after_max_attempts(self):
+        with self.assertLogs('portfolio.outbox', 'WARNING'):
+            call_command('process_outbox', stdout=StringIO())
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.FAILED)
@@ -1,6 +1,9 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse, resolve
 from .. import views
+from ..models import PastWork, Tool
+from ..tools import parse_tools
 from .utils import create_and_login_superuser, create_pastwork
 
 
@@ -43,6 +46,118 @@ class PastWorksViewTests(TestCase):
         self.assertContains(response, 'Delete')
 
 
+class PastWorksViewKeysetPaginationTests(TestCase):
+    url = None
+
+    def setUp(self):
+        for number in range(5):
+            create_pastwork(name=f'Project {number}', github_link=f'https://github.com/{number}')
+        self.url = reverse('pastworks')
+
+    def test_next_cursors_walk_every_past_work_once(self):
+        names = []
+        response = self.client.get(self.url)
+        while True:
+            names += [pastwork.name for pastwork in response.context['pastworks']]
+            page = response.context['page_obj']
+            if not page.has_next():
+                break
+            response = self.client.get(self.url, {'after': page.next_cursor})
+        self.assertEqual(names, [f'Project {number}' for number in reversed(range(5))])
+
+    def test_previous_cursor_returns_the_previous_page(self):
+        first_page = self.client.get(self.url).context['page_obj']
+        second_page = self.client.get(self.url, {'after': first_page.next_cursor}).context['page_obj']
+        response = self.client.get(self.url, {'before': second_page.previous_cursor})
+        self.assertEqual(list(response.context['pastworks']), list(first_page))
+        self.assertFalse(response.context['page_obj'].has_previous())
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        page = self.client.get(self.url).context['page_obj']
+        with self.assertNumQueries(4):
+            self.client.get(self.url)
+        with self.assertNumQueries(4):
+            self.client.get(self.url, {'after': page.next_cursor})
+
+    def test_pagination_links_use_cursors(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, f'?after={response.context["page_obj"].next_cursor}')
+
+    def test_tampered_cursor_is_not_found(self):
+        response = self.client.get(self.url, {'after': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+class PastWorksViewToolFacetTests(TestCase):
+    url = None
+
+    def setUp(self):
+        cache.clear()
+        PastWork.objects.create(name='Blog', description='A blog', tools_used='Django, Docker, Postgres',
+                                github_link='https://github.com/blog')
+        PastWork.objects.create(name='Shop', description='A shop', tools_used='Django; React',
+                                github_link='https://github.com/shop')
+        PastWork.objects.create(name='Game', description='A game', tools_used='Pygame',
+                                github_link='https://github.com/game')
+        self.url = reverse('pastworks')
+
+    def names(self, response):
+        return sorted(pastwork.name for pastwork in response.context['pastworks'])
+
+    def test_tools_used_is_parsed_into_tools(self):
+        self.assertEqual(sorted(Tool.objects.values_list('slug', flat=True)),
+                         ['django', 'docker', 'postgres', 'pygame', 'react'])
+        blog = PastWork.objects.get(name='Blog')
+        blog.tools_used = 'Django'
+        blog.save()
+        self.assertEqual(list(blog.tools.values_list('slug', flat=True)), ['django'])
+
+    def test_symbols_keep_tools_apart(self):
+        self.assertEqual(parse_tools('C, C++, C#, .NET, ASP.NET'),
+                         [('c', 'C'), ('cplusplus', 'C++'), ('csharp', 'C#'), ('dotnet', '.NET'),
+                          ('aspnet', 'ASP.NET')])
+        PastWork.objects.create(name='Engine', description='An engine', tools_used='C++',
+                                github_link='https://github.com/engine')
+        self.assertEqual(self.names(self.client.get(self.url, {'tool': 'cplusplus'})), ['Engine'])
+        self.assertEqual(self.names(self.client.get(self.url, {'tool': 'c'})), [])
+
+    def test_admin_edits_tools_through_tools_used_only(self):
+        create_and_login_superuser(self.client)
+        blog = PastWork.objects.get(name='Blog')
+        url = reverse('admin:portfolio_pastwork_change', args=[blog.id])
+        self.assertNotContains(self.client.get(url), 'name="tools"')
+        self.client.post(url, {'name': 'Blog', 'description': 'A blog', 'tools_used': 'Django, React',
+                               'github_link': 'https://github.com/blog', 'page_link': '',
+                               'tools': [Tool.objects.get(slug='pygame').id]})
+        self.assertEqual(sorted(blog.tools.values_list('slug', flat=True)), ['django', 'react'])
+
+    def test_filter_by_one_tool(self):
+        response = self.client.get(self.url, {'tool': 'django'})
+        self.assertEqual(self.names(response), ['Blog', 'Shop'])
+
+    def test_filter_by_several_tools_requires_all_of_them(self):
+        response = self.client.get(self.url, {'tool': ['django', 'docker']})
+        self.assertEqual(self.names(response), ['Blog'])
+
+    def test_facet_counts_follow_the_filter(self):
+        response = self.client.get(self.url, {'tool': 'django'})
+        counts = {facet['tool'].slug: facet['count'] for facet in response.context['tool_facets']}
+        self.assertEqual(counts, {'django': 2, 'docker': 1, 'postgres': 1, 'react': 1})
+        self.assertContains(response, 'Django (2)')
+
+    def test_tools_are_prefetched(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {'tool': 'django'})
+        self.assertContains(response, '?tool=docker')
+
+    def test_pagination_keeps_the_tool_filter(self):
+        PastWork.objects.create(name='Chat', description='A chat', tools_used='Django',
+                                github_link='https://github.com/chat')
+        response = self.client.get(self.url, {'tool': 'django'})
+        self.assertContains(response, f'?tool=django&amp;after={response.context["page_obj"].next_cursor}')
+
+
 class PastWorkViewTests(TestCase):
     response = None
     past_work = None
@@ -74,6 +189,60 @@ class PastWorkViewTests(TestCase):
         )
 
 
+class PastWorkConditionalGetTests(TestCase):
+    past_work = None
+
+    def setUp(self):
+        cache.clear()
+        self.past_work = create_pastwork()
+
+    def test_detail_answers_matching_etag_with_one_query(self):
+        url = reverse('pastwork', args=[str(self.past_work.id)])
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_answers_if_modified_since(self):
+        url = reverse('pastwork', args=[str(self.past_work.id)])
+        response = self.client.get(url)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_is_rendered_again_after_an_edit(self):
+        url = reverse('pastwork', args=[str(self.past_work.id)])
+        etag = self.client.get(url)['ETag']
+        self.past_work.description = 'An edited portfolio app'
+        self.past_work.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'An edited portfolio app')
+
+    def test_missing_detail_is_still_not_found(self):
+        response = self.client.get(reverse('pastwork', args=['999']), HTTP_IF_NONE_MATCH='"anything"')
+        self.assertEqual(response.status_code, 404)
+
+    def test_list_answers_matching_etag(self):
+        url = reverse('pastworks')
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_is_rendered_again_after_a_delete(self):
+        url = reverse('pastworks')
+        etag = self.client.get(url)['ETag']
+        self.past_work.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_superusers_always_get_a_fresh_page(self):
+        create_and_login_superuser(self.client)
+        response = self.client.get(reverse('pastworks'))
+        self.assertNotIn('ETag', response)
+        self.assertContains(response, 'Edit')
+
+
 class NewPastWorkViewForNormalUsers(TestCase):
     response = None
 
@@ -0,0 +1,131 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ..cache import CSRF_TOKEN_PLACEHOLDER
+from ..models import About, PastWork, Reason, Tool
+from ..prerender import page_file, page_paths, prerender_pages
+from .utils import create_pastworks
+
+
+class PrerenderTestCase(TestCase):
+    root = None
+
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        settings_override = override_settings(PRERENDER_ROOT=self.root, PRERENDER_ENABLED=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        Reason.objects.create(purpose='Hiring')
+        About.objects.create(paragraph='I am a backend developer')
+        create_pastworks(5)
+
+    def files(self):
+        return sorted(str(path.relative_to(self.root)) for path in Path(self.root).rglob('*.html'))
+
+
+class PrerenderPagesTests(PrerenderTestCase):
+
+    def test_command_renders_every_public_page(self):
+        output = StringIO()
+        call_command('prerender_pages', workers=1, stdout=output)
+        paths = list(page_paths())
+        # Three list pages reached forwards and two more reached through their "previous" links.
+        self.assertEqual(len([group for group, _ in paths if group == 'pastworks']), 5)
+        self.assertEqual(len(paths), 1 + 5 + 5)
+        self.assertIn(f'Rendered {len(paths)} page(s)', output.getvalue())
+        for group, path in paths:
+            self.assertTrue(page_file(group, path).exists(), path)
+
+    def test_home_page_keeps_a_csrf_placeholder(self):
+        prerender_pages()
+        content = page_file('home', reverse('home')).read_text()
+        self.assertIn(CSRF_TOKEN_PLACEHOLDER, content)
+        self.assertIn('I am a backend developer', content)
+
+    def test_list_page_links_point_at_rendered_pages(self):
+        prerender_pages()
+        paths = {path for _, path in page_paths()}
+        content = page_file('pastworks', reverse('pastworks')).read_text()
+        cursor = content.split('href="?after=')[1].split('"')[0]
+        self.assertIn(f'/pastworks?after={cursor}', paths)
+
+    def test_only_missing_pages_are_rendered(self):
+        self.assertEqual(prerender_pages(), 11)
+        self.assertEqual(prerender_pages(), 0)
+
+    def test_about_change_discards_the_home_page_only(self):
+        prerender_pages()
+        About.objects.create(paragraph='Another paragraph')
+        self.assertFalse(page_file('home', reverse('home')).exists())
+        self.assertTrue(page_file('pastworks', reverse('pastworks')).exists())
+        self.assertEqual(prerender_pages(), 1)
+
+    def test_pastwork_change_discards_its_pages(self):
+        prerender_pages()
+        before = len(self.files())
+        pastwork = PastWork.objects.first()
+        pastwork.description = 'Changed'
+        pastwork.save()
+        self.assertFalse(page_file(f'pastwork-{pastwork.pk}', reverse('pastwork', args=[pastwork.pk])).exists())
+        self.assertFalse(page_file('pastworks', reverse('pastworks')).exists())
+        # Home, the five list pages and the edited past work's own page.
+        self.assertEqual(before - len(self.files()), 7)
+        self.assertEqual(prerender_pages(), 7)
+
+    def test_tool_change_discards_the_list_pages(self):
+        tool = Tool.objects.create(name='Docker', slug='docker')
+        prerender_pages()
+        tool.save()
+        self.assertFalse(page_file('pastworks', reverse('pastworks')).exists())
+        self.assertTrue(page_file('home', reverse('home')).exists())
+
+    def test_rebuild_all(self):
+        prerender_pages()
+        self.assertEqual(prerender_pages(rebuild_all=True), 11)
+
+
+class PrerenderedPageMiddlewareTests(PrerenderTestCase):
+
+    def setUp(self):
+        super().setUp()
+        prerender_pages()
+
+    def test_anonymous_get_is_served_from_disk(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'I am a backend developer')
+        self.assertNotContains(response, CSRF_TOKEN_PLACEHOLDER)
+        self.assertIn('csrftoken', response.cookies)
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+
+    def test_cursor_pages_are_served_from_disk(self):
+        path = [path for group, path in page_paths() if '?after=' in path][0]
+        with self.assertNumQueries(0):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unrendered_query_reaches_the_view(self):
+        response = self.client.get(reverse('pastworks'), {'tool': 'docker'})
+        self.assertIn('tool_facets', response.context)
+
+    def test_signed_in_users_reach_the_view(self):
+        user = get_user_model().objects.create_superuser(username='admin', email='admin@example.com',
+                                                         password='password')
+        self.client.force_login(user)
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, reverse('new_pastwork'))
+
+    @override_settings(PRERENDER_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get(reverse('home'))
+        self.assertIsNotNone(response.context)
@@ -0,0 +1,85 @@
+import re
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from ..archive import archive_messages
+from ..models import ArchivedMessage, Message, OutboxEmail, PastWork, Reason
+from .utils import create_and_login_superuser, create_messages, create_pastworks, query_plan_problems
+
+# The tables that grow with the site; the others hold a handful of rows and are read whole.
+LARGE_TABLES = ('portfolio_pastwork', 'portfolio_message', 'portfolio_archivedmessage', 'portfolio_outboxemail')
+MAIN_TABLE = re.compile(r'\bFROM "?(\w+)"?')
+
+
+class QueryPlanTests(TestCase):
+    """Every query a page runs against a large table is served by an index, with no full scan or sort."""
+
+    def setUp(self):
+        create_and_login_superuser(self.client)
+        self.reason = Reason.objects.create(purpose='Hiring')
+        create_pastworks(20)
+        create_messages(40, [self.reason, Reason.objects.create(purpose='Freelance')])
+        Message.objects.filter(id__lte=Message.objects.order_by('id')[20].id).update(
+            date=timezone.now() - timedelta(days=400))
+        archive_messages(older_than_days=365)
+
+    def assertIndexedPlan(self, sql, params=None):
+        problems = query_plan_problems(sql, params)
+        self.assertFalse(problems, f'{problems} in the plan for {sql}')
+
+    def assertIndexedPage(self, url, params=None):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        checked = 0
+        for query in captured.captured_queries:
+            table = MAIN_TABLE.search(query['sql'])
+            if query['sql'].startswith('SELECT') and table and table.group(1) in LARGE_TABLES:
+                self.assertIndexedPlan(query['sql'])
+                checked += 1
+        self.assertTrue(checked, f'{url} ran no query on a large table')
+        return response
+
+    def next_page(self, response):
+        return response.content.decode().split('after=')[1].split('"')[0]
+
+    def test_home_page(self):
+        self.assertIndexedPage(reverse('home'))
+
+    def test_past_works_pages(self):
+        response = self.assertIndexedPage(reverse('pastworks'))
+        self.assertIndexedPage(reverse('pastworks'), {'after': self.next_page(response)})
+        self.assertIndexedPage(reverse('api_pastworks'))
+
+    def test_inbox_pages(self):
+        response = self.assertIndexedPage(reverse('received_messages'))
+        self.assertIndexedPage(reverse('received_messages'), {'after': self.next_page(response)})
+        response = self.assertIndexedPage(reverse('received_messages'), {'reason': self.reason.id})
+        self.assertIndexedPage(reverse('received_messages'), {'reason': self.reason.id,
+                                                              'after': self.next_page(response)})
+
+    def test_archive_pages(self):
+        year = ArchivedMessage.objects.first().date.year
+        response = self.assertIndexedPage(reverse('archived_messages'))
+        self.assertIndexedPage(reverse('archived_messages'), {'after': self.next_page(response)})
+        self.assertIndexedPage(reverse('archived_messages'), {'year': year})
+
+    def test_background_jobs(self):
+        cutoff = timezone.now() - timedelta(days=365)
+        self.assertIndexedPlan(*Message.objects.filter(date__lt=cutoff, notified=True).order_by('date', 'id')[:100]
+                               .query.sql_with_params())
+        self.assertIndexedPlan(*Message.objects.filter(notified=False).order_by('date', 'id')[:100]
+                               .query.sql_with_params())
+        self.assertIndexedPlan(*OutboxEmail.objects.filter(status=OutboxEmail.PENDING, next_attempt_at__lte=cutoff)
+                               .order_by('next_attempt_at', 'id')[:50].query.sql_with_params())
+
+    def test_detects_scans_and_sorts(self):
+        self.assertTrue(query_plan_problems(*PastWork.objects.filter(description='x').query.sql_with_params()))
+        self.assertTrue(query_plan_problems(*Message.objects.order_by('email')[:5].query.sql_with_params()))
+        # A page in id order still scans every row when a filter no index serves has to skip most of them.
+        self.assertTrue(query_plan_problems(*Message.objects.filter(email='sender3@doe.com').order_by('-id')[:5]
+                                            .query.sql_with_params()))
@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ..models import Message
+from ..ratelimit import SlidingWindowRateLimiter
+from ..spam import form_timestamp
+from .utils import create_reason
+
+
+@override_settings(SEND_MESSAGE_RATE_LIMIT=2, SEND_MESSAGE_RATE_WINDOW=60)
+class SendMessageRateLimitTests(TestCase):
+    reason = None
+    url = None
+
+    def setUp(self):
+        cache.clear()
+        self.reason = create_reason()
+        self.url = reverse('send_message')
+
+    def send(self, email='jane@doe.com', ip='10.0.0.1', message='Hey Dele'):
+        return self.client.post(self.url, {'reason': self.reason.id, 'name': 'Jane Doe',
+                                           'email': email, 'message': message,
+                                           'rendered_at': form_timestamp()}, REMOTE_ADDR=ip)
+
+    def test_client_over_the_limit_gets_429_with_retry_after(self):
+        self.send()
+        self.send(message='Are you free for a call next week?')
+        response = self.send(message='One more thing')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(Message.objects.count(), 2)
+
+    def test_limit_applies_per_email_across_addresses(self):
+        self.send(ip='10.0.0.1')
+        with self.assertLogs('portfolio.spam') as logs:
+            self.send(ip='10.0.0.2')
+        self.assertIn('duplicate', logs.output[0])
+        self.assertEqual(self.send(ip='10.0.0.3').status_code, 429)
+
+    def test_limit_applies_per_address_across_emails(self):
+        self.send(email='a@doe.com')
+        self.send(email='b@doe.com')
+        self.assertEqual(self.send(email='c@doe.com').status_code, 429)
+
+    def test_other_clients_are_unaffected(self):
+        self.send()
+        with self.assertLogs('portfolio.spam') as logs:
+            self.send()
+        self.assertIn('duplicate', logs.output[0])
+        self.assertEqual(self.send(email='john@doe.com', ip='10.0.0.9').status_code, 302)
+
+
+class SlidingWindowRateLimiterTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hit_is_refused_when_any_identity_is_over_the_limit(self):
+        limiter = SlidingWindowRateLimiter(1, 60)
+        self.assertEqual(limiter.hit('ip:1'), 0)
+        self.assertGreater(limiter.hit('ip:1', 'email:jane'), 0)
+        self.assertEqual(limiter.hit('email:jane'), 0)
@@ -0,0 +1,101 @@
+from django.test import TestCase
+from django.urls import reverse, resolve
+from .. import views
+from ..models import PastWork
+from ..search import get_search_backend
+from .utils import create_pastwork, create_pastworks
+
+
+class SearchIndexTests(TestCase):
+    backend = None
+
+    def setUp(self):
+        self.backend = get_search_backend()
+
+    def names(self, query):
+        return [pastwork.name for pastwork in self.backend.search(query, 10)]
+
+    def test_saved_past_works_are_searchable(self):
+        create_pastwork(name='Weather dashboard', github_link='https://github.com/weather')
+        self.assertEqual(self.names('weather'), ['Weather dashboard'])
+
+    def test_name_matches_rank_above_description_matches(self):
+        PastWork.objects.create(name='Shop', description='A docker deployment demo',
+                                github_link='https://github.com/shop')
+        PastWork.objects.create(name='Docker dashboard', description='Container stats',
+                                github_link='https://github.com/docker')
+        self.assertEqual(self.names('docker'), ['Docker dashboard', 'Shop'])
+
+    def test_edits_and_deletes_keep_the_index_current(self):
+        pastwork = create_pastwork(name='Weather dashboard', github_link='https://github.com/weather')
+        pastwork.name = 'Climate dashboard'
+        pastwork.save()
+        self.assertEqual(self.names('weather'), [])
+        self.assertEqual(self.names('climate'), ['Climate dashboard'])
+        pastwork.delete()
+        self.assertEqual(self.names('climate'), [])
+
+    def test_rebuild_indexes_bulk_created_rows(self):
+        create_pastworks(3)
+        self.assertEqual(self.names('project'), [])
+        self.backend.rebuild()
+        self.assertEqual(len(self.names('project')), 3)
+
+    def test_cursor_pages_cover_every_match_once(self):
+        create_pastworks(5)
+        self.backend.rebuild()
+        page = self.backend.search('project', 2)
+        names = [pastwork.name for pastwork in page]
+        while page.has_next():
+            page = self.backend.search('project', 2, after=page.next_cursor)
+            names += [pastwork.name for pastwork in page]
+        self.assertEqual(sorted(names), [f'Project {number}' for number in range(5)])
+
+    def test_before_cursor_returns_the_previous_page(self):
+        create_pastworks(5)
+        self.backend.rebuild()
+        first = self.backend.search('project', 2)
+        second = self.backend.search('project', 2, after=first.next_cursor)
+        self.assertTrue(second.has_previous())
+        back = self.backend.search('project', 2, before=second.previous_cursor)
+        self.assertEqual([pastwork.id for pastwork in back], [pastwork.id for pastwork in first])
+        self.assertFalse(back.has_previous())
+        self.assertEqual(back.next_cursor, first.next_cursor)
+
+    def test_query_syntax_is_not_passed_through(self):
+        create_pastwork()
+        self.assertEqual(self.names('portfolio"*) -'), ['Portfolio'])
+
+
+class PastWorkSearchViewTests(TestCase):
+
+    def setUp(self):
+        create_pastworks(12)
+        get_search_backend().rebuild()
+
+    def test_search_page_lists_matches(self):
+        response = self.client.get(reverse('pastwork_search'), {'q': 'project 7'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'pastwork_search.html')
+        self.assertEqual(response.context['pastworks'][0].name, 'Project 7')
+
+    def test_next_link_keeps_the_query(self):
+        response = self.client.get(reverse('pastwork_search'), {'q': 'project'})
+        self.assertContains(response, f'?q=project&amp;after={response.context["page_obj"].next_cursor}')
+
+    def test_previous_link_keeps_the_query(self):
+        first = self.client.get(reverse('pastwork_search'), {'q': 'project'}).context['page_obj']
+        response = self.client.get(reverse('pastwork_search'), {'q': 'project', 'after': first.next_cursor})
+        previous = response.context['page_obj'].previous_cursor
+        self.assertContains(response, f'?q=project&amp;before={previous}')
+        self.assertNotContains(response, '?page=')
+        back = self.client.get(reverse('pastwork_search'), {'q': 'project', 'before': previous})
+        self.assertEqual(list(back.context['page_obj']), list(first))
+
+    def test_no_matches(self):
+        response = self.client.get(reverse('pastwork_search'), {'q': 'kubernetes'})
+        self.assertContains(response, 'No past works match "kubernetes".')
+
+    def test_search_url_resolves_search_view(self):
+        view = resolve('/pastworks/search')
+        self.assertEqual(view.func.__name__, views.PastWorkSearchView.as_view().__name__)
@@ -1,7 +1,11 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse, resolve
-from ..models import Message
+from ..models import Message, Reason
 from .. import views
+from ..cache import reason_lookup
+from ..forms import MessageForm
+from ..spam import form_timestamp
 from .utils import create_and_login_superuser, create_reason, create_message
 
 
@@ -10,13 +14,15 @@ class SendMessageViewTests(TestCase):
     message_query = None
 
     def setUp(self):
+        cache.clear()
         create_reason()
         url = reverse('send_message')
         self.response = self.client.post(url,
                                          {'reason': '1',
                                           'name': 'Jane Doe',
                                           'email': 'jane@doe.com',
-                                          'message': 'Hey Dele'},
+                                          'message': 'Hey Dele',
+                                          'rendered_at': form_timestamp()},
                                          follow=True)
         self.message_query = Message.objects.get(id=1)
 
@@ -36,6 +42,36 @@ class SendMessageViewTests(TestCase):
         self.assertTrue(self.message_query.message, 'Hey Dele')
 
 
+class SendMessageViewQueryTests(TestCase):
+    reason = None
+
+    def setUp(self):
+        cache.clear()
+        self.reason = create_reason()
+        reason_lookup()
+
+    def test_submission_only_writes_the_message_and_its_email(self):
+        with self.assertNumQueries(4) as captured:
+            self.client.post(reverse('send_message'), {'reason': self.reason.id,
+                                                       'name': 'Jane Doe',
+                                                       'email': 'jane@doe.com',
+                                                       'message': 'Hey Dele',
+                                                       'rendered_at': form_timestamp()})
+        statements = [query['sql'].split()[0] for query in captured.captured_queries]
+        self.assertEqual(statements, ['SAVEPOINT', 'INSERT', 'INSERT', 'RELEASE'])
+
+    def test_unknown_reason_is_rejected(self):
+        form = MessageForm({'reason': self.reason.id + 1, 'name': 'Jane Doe',
+                            'email': 'jane@doe.com', 'message': 'Hey Dele'})
+        self.assertFalse(form.is_valid())
+        self.assertIn('reason', form.errors)
+
+    def test_renamed_reason_reaches_the_lookup_table(self):
+        self.reason.purpose = 'Just saying hi'
+        self.reason.save()
+        self.assertEqual(reason_lookup()[self.reason.id].purpose, 'Just saying hi')
+
+
 class MessagesReceivedViewTestsForNormalUsers(TestCase):
     response = None
 
@@ -71,4 +107,32 @@ class MessagesReceivedViewTestsForSuperUsers(TestCase):
         self.assertEqual(
             view.func.__name__,
             views.MessagesReceivedView.as_view().__name__
-        )
\ No newline at end of file
+        )
+
+
+class MessagesReceivedViewQueryTests(TestCase):
+    url = None
+
+    def setUp(self):
+        create_and_login_superuser(self.client)
+        self.url = reverse('received_messages')
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        create_message()
+        with self.assertNumQueries(3):
+            self.client.get(self.url)
+        reason = Reason.objects.get()
+        for number in range(views.MessagesReceivedView.paginate_by):
+            Message.objects.create(reason=reason, name=f'Sender {number}', email='jane@doe.com', message='Hi')
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['received_messages']), views.MessagesReceivedView.paginate_by)
+
+    def test_reason_filter(self):
+        other = Message.objects.create(reason=Reason.objects.create(purpose='Freelance'), name='John Doe',
+                                       email='john@doe.com', message='Hi')
+        create_message()
+        response = self.client.get(self.url, {'reason': other.reason_id})
+        self.assertEqual(list(response.context['received_messages']), [other])
+        self.assertContains(response, 'All reasons')
+        self.assertEqual(len(self.client.get(self.url, {'reason': 'x'}).context['received_messages']), 2)
@@ -0,0 +1,144 @@
+import json
+import time
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from ..cache import FORM_RENDERED_AT_PLACEHOLDER
+from ..models import Message, OutboxEmail
+from ..spam import RecentMessageIndex, form_timestamp, score_submission, seconds_since_rendered, simhash
+from .utils import create_reason
+
+LONG_MESSAGE = ('Hello Dele, I run a small agency and we are looking for a Django developer '
+                'to help us rebuild our booking platform over the next three months.')
+
+
+def bits_apart(first, second):
+    return bin(first ^ second).count('1')
+
+
+class ScoreSubmissionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.now = time.time() + 60
+        self.data = {'name': 'Jane Doe', 'email': 'jane@doe.com', 'message': LONG_MESSAGE,
+                     'rendered_at': form_timestamp()}
+
+    def test_a_human_submission_is_accepted(self):
+        verdict = score_submission(self.data, RecentMessageIndex(), self.now)
+        self.assertTrue(verdict.accepted)
+        self.assertEqual(verdict.reasons, [])
+
+    def test_filled_honeypot_is_spam(self):
+        verdict = score_submission({**self.data, 'website': 'https://example.com'}, now=self.now)
+        self.assertTrue(verdict.spam)
+        self.assertIn('honeypot', verdict.reasons)
+
+    def test_submitting_too_soon_after_rendering_is_spam_alongside_a_link_dump(self):
+        data = {**self.data, 'message': 'https://a.example https://b.example https://c.example'}
+        self.assertTrue(score_submission(data, now=self.now).spam)
+        verdict = score_submission(data, now=time.time())
+        self.assertEqual(verdict.reasons, ['too_fast', 'links', 'link_density'])
+
+    def test_missing_or_forged_timestamp_counts_against_a_submission(self):
+        self.assertIsNone(seconds_since_rendered('forged'))
+        verdict = score_submission({**self.data, 'rendered_at': 'forged'}, now=self.now)
+        self.assertEqual(verdict.reasons, ['no_timestamp'])
+        self.assertFalse(verdict.spam)
+
+    def test_spam_skips_the_duplicate_lookup(self):
+        with self.assertNumQueries(0):
+            verdict = score_submission({**self.data, 'website': 'x', 'rendered_at': ''}, RecentMessageIndex())
+        self.assertEqual(verdict.fingerprint, 0)
+
+
+class RecentMessageIndexTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.index = RecentMessageIndex()
+
+    def test_simhash_keeps_near_duplicates_close(self):
+        edited = LONG_MESSAGE.replace('three', 'four')
+        self.assertLessEqual(bits_apart(simhash(LONG_MESSAGE), simhash(edited)), 8)
+        self.assertGreater(bits_apart(simhash(LONG_MESSAGE), simhash('Can we talk about a role at a bank?')), 8)
+
+    def test_near_duplicate_of_a_recent_message_is_caught(self):
+        self.index.add(simhash(LONG_MESSAGE), 'jane@doe.com')
+        verdict = score_submission({'email': 'john@doe.com', 'message': LONG_MESSAGE.replace('three', 'four'),
+                                    'rendered_at': form_timestamp()}, self.index, time.time() + 60)
+        self.assertTrue(verdict.duplicate)
+        self.assertFalse(verdict.accepted)
+
+    def test_short_messages_only_match_the_same_sender(self):
+        fingerprint = simhash('Hey Dele')
+        self.index.add(fingerprint, 'jane@doe.com')
+        self.assertIsNone(self.index.find(fingerprint, 'john@doe.com', 2))
+        self.assertEqual(self.index.find(fingerprint, 'Jane@Doe.com', 2), fingerprint)
+
+    @override_settings(SPAM_DUPLICATE_WINDOW=60, SPAM_DUPLICATE_HISTORY=2)
+    def test_history_is_bounded_by_age_and_size(self):
+        now = time.time()
+        self.index.add(1, 'a@doe.com', now - 120)
+        self.index.add(2, 'b@doe.com', now)
+        self.assertEqual([entry[0] for entry in self.index.recent(now)], [2])
+        self.index.add(3, 'c@doe.com', now)
+        self.index.add(4, 'd@doe.com', now)
+        self.assertEqual([entry[0] for entry in self.index.recent(now)], [4, 3])
+
+
+class SendMessageSpamTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.reason = create_reason()
+        self.url = reverse('send_message')
+
+    def send(self, **fields):
+        data = {'reason': self.reason.id, 'name': 'Jane Doe', 'email': 'jane@doe.com', 'message': LONG_MESSAGE,
+                'rendered_at': form_timestamp(), **fields}
+        return self.client.post(self.url, data, follow=True)
+
+    def test_spam_is_answered_like_a_success_without_a_write_or_an_email(self):
+        with self.assertLogs('portfolio.spam') as logs:
+            response = self.send(website='https://example.com')
+        self.assertContains(response, 'Your message was sent successfully')
+        self.assertFalse(Message.objects.exists())
+        self.assertFalse(OutboxEmail.objects.exists())
+        logged = json.loads(logs.records[0].getMessage())
+        self.assertEqual(logged['reasons'][:2], ['honeypot', 'too_fast'])
+        self.assertNotIn('jane@doe.com', logs.output[0])
+
+    def test_resent_message_is_stored_once(self):
+        with self.settings(SPAM_MIN_SUBMIT_SECONDS=0):
+            self.send()
+            with self.assertLogs('portfolio.spam'):
+                response = self.send(message=LONG_MESSAGE + '!!', email='other@doe.com')
+        self.assertContains(response, 'Your message was sent successfully')
+        self.assertEqual(Message.objects.count(), 1)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_home_page_renders_a_fresh_timestamp_even_when_cached(self):
+        first = self.client.get(reverse('home'))
+        second = self.client.get(reverse('home'))
+        for response in (first, second):
+            self.assertContains(response, 'name="website"')
+            self.assertNotContains(response, FORM_RENDERED_AT_PLACEHOLDER)
+            value = response.content.decode().split('name="rendered_at" value="')[1].split('"')[0]
+            self.assertLess(seconds_since_rendered(value), 5)
+
+
+class BenchmarkSpamCommandTests(TestCase):
+
+    def test_reports_throughput_and_verdicts(self):
+        output = StringIO()
+        call_command('benchmark_spam', submissions=200, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['submissions'], 200)
+        self.assertGreater(report['submissions_per_second'], 0)
+        self.assertEqual(sum(report['verdicts'].values()), 200)
+        self.assertNotIn('ham:duplicate', report['verdicts'])
+        self.assertNotIn('spam:accepted', report['verdicts'])
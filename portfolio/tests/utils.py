@@ -1,4 +1,11 @@
+import json
+import re
+from smtplib import SMTPException
+
 from django.contrib.auth import get_user_model
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import connection
+from ..benchmarking import create_messages, create_pastworks  # noqa: F401
 from ..models import PastWork, Reason, Message, Competency, About
 
 
@@ -11,9 +18,9 @@ def create_and_login_superuser(client):
     client.login(username='delesuper', password='password')
 
 
-def create_pastwork():
-    return PastWork.objects.create(name='Portfolio', description='My portfolio app',
-                                   github_link='https://github.com', page_link='https://app.com')
+def create_pastwork(name='Portfolio', github_link='https://github.com'):
+    return PastWork.objects.create(name=name, description='My portfolio app',
+                                   github_link=github_link, page_link='https://app.com')
 
 
 def create_reason():
@@ -30,4 +37,52 @@ def create_skill():
 
 
 def create_about():
-    return About.objects.create(paragraph='I am a backend developer')
\ No newline at end of file
+    return About.objects.create(paragraph='I am a backend developer')
+
+
+def _postgres_plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from _postgres_plan_nodes(child)
+
+
+def query_plan_problems(sql, params=None):
+    """
+    The full-table scans and sorts in the database's plan for ``sql``.
+
+    On SQLite that is any temp B-tree, and a ``SCAN`` without an index
+    unless the query has no WHERE clause and is ordered by the primary key
+    alone with a LIMIT, so the scan walks rowids and stops after a page.
+    Postgres is asked to avoid sequential scans and sorts where it can, so a
+    ``Seq Scan`` or ``Sort`` left in its plan means no index serves the
+    query, however small the test tables are; so does an index walked end to
+    end with a filter and no index condition.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET enable_seqscan = off; SET enable_sort = off')
+            try:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            finally:
+                cursor.execute('RESET enable_seqscan; RESET enable_sort')
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            return [f'{node["Node Type"]} {node.get("Relation Name", "")}'.strip()
+                    for node in _postgres_plan_nodes(plan[0]['Plan'])
+                    if node['Node Type'] in ('Seq Scan', 'Sort')
+                    or (node['Node Type'] in ('Index Scan', 'Index Only Scan')
+                        and 'Filter' in node and 'Index Cond' not in node)]
+
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        details = [row[-1] for row in cursor.fetchall()]
+    sorts = [detail for detail in details if 'TEMP B-TREE' in detail]
+    paged = (not sorts and not re.search(r'\bWHERE\b', sql)
+             and re.search(r'\bORDER BY (?:"\w+"\.)?"id"(?: ASC| DESC)? LIMIT\b', sql))
+    scans = [detail for detail in details
+             if re.match(r'SCAN (TABLE )?\w+$', detail) and not paged]
+    return scans + sorts
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPException('Mail relay unavailable')
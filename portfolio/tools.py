@@ -0,0 +1,42 @@
+import re
+
+from django.utils.text import slugify
+from .models import PastWork, Tool
+
+TOOL_SEPARATORS = re.compile(r'[,;/\n]|\band\b')
+
+
+def tool_slug(name):
+    # slugify drops these symbols, which would file C++ and C# under C and .NET under NET.
+    if name.startswith('.'):
+        name = 'dot' + name[1:]
+    return slugify(name.replace('+', 'plus').replace('#', 'sharp'))[:50]
+
+
+def parse_tools(tools_used):
+    """The distinct (slug, name) pairs listed in a free-form ``tools_used`` string."""
+    tools = {}
+    for name in TOOL_SEPARATORS.split(tools_used or ''):
+        name = ' '.join(name.split())[:50]
+        slug = tool_slug(name)
+        if slug and slug not in tools:
+            tools[slug] = name
+    return list(tools.items())
+
+
+def sync_tools(pastworks):
+    """Point each past work's ``tools`` at the tools its ``tools_used`` text lists, creating any new ones."""
+    parsed = {pastwork.id: parse_tools(pastwork.tools_used) for pastwork in pastworks}
+    names = {slug: name for tools in parsed.values() for slug, name in tools}
+    existing = {tool.slug: tool.id for tool in Tool.objects.filter(slug__in=names)}
+    missing = [Tool(slug=slug, name=name) for slug, name in names.items() if slug not in existing]
+    if missing:
+        Tool.objects.bulk_create(missing, ignore_conflicts=True)
+        existing = dict(Tool.objects.filter(slug__in=names).values_list('slug', 'id'))
+
+    through = PastWork.tools.through
+    through.objects.filter(pastwork_id__in=parsed).delete()
+    through.objects.bulk_create(
+        [through(pastwork_id=pastwork_id, tool_id=existing[slug])
+         for pastwork_id, tools in parsed.items() for slug, _ in tools],
+        batch_size=1000)
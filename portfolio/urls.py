@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path('', views.HomePageView.as_view(), name='home'),
@@ -15,9 +15,14 @@ urlpatterns = [
     path('reasons/<int:pk>/delete', views.DeleteReasonView.as_view(), name='delete_reason'),
     path('message/send', views.SendMessageView.as_view(), name='send_message'),
     path('message/received', views.MessagesReceivedView.as_view(), name='received_messages'),
+    path('message/archived', views.ArchivedMessagesView.as_view(), name='archived_messages'),
     path('pastworks', views.PastWorksView.as_view(), name='pastworks'),
+    path('pastworks/search', views.PastWorkSearchView.as_view(), name='pastwork_search'),
     path('pastwork/new', views.NewPastWorkView.as_view(), name='new_pastwork'),
     path('pastwork/<int:pk>', views.PastWorkView.as_view(), name='pastwork'),
     path('pastwork/<int:pk>/edit', views.UpdatePastWorkView.as_view(), name='update_pastwork'),
     path('pastwork/<int:pk>/delete', views.DeletePastWorkView.as_view(), name='delete_pastwork'),
+    path('api/abouts', api.AboutApiView.as_view(), name='api_abouts'),
+    path('api/competencies', api.CompetencyApiView.as_view(), name='api_competencies'),
+    path('api/pastworks', api.PastWorkApiView.as_view(), name='api_pastworks'),
 ]
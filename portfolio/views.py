@@ -1,26 +1,46 @@
+import hashlib
+from datetime import datetime
+from urllib.parse import urlencode
+
 from django.conf import settings
-from django.core.paginator import Paginator
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Count
+from django.shortcuts import redirect
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.views.generic import TemplateView, ListView, DetailView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
-from .models import About, Competency, Reason, Message, PastWork
-
-
-class HomePageView(ListView):
+from .cache import get_content_versions, pastworks_last_modified
+from .digest import digest_enabled
+from .forms import MessageForm
+from .mixins import AnonymousPageCacheMixin, ConditionalGetMixin, SendMessageRateLimitMixin
+from .models import About, ArchivedMessage, Competency, Reason, Message, PastWork, Tool
+from .outbox import queue_message_notification
+from .pagination import KeysetPaginationMixin, keyset_page, page_query
+from .search import get_search_backend
+from .spam import RecentMessageIndex, form_timestamp, log_verdict, score_submission
+
+
+class HomePageView(AnonymousPageCacheMixin, ListView):
     model = About
+    cache_models = (About, Competency, Reason, PastWork)
     context_object_name = 'abouts'
     template_name = 'home.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['competencies'] = Competency.objects.all()
+        # Left unevaluated so a cached template fragment never runs their queries.
         context['reasons'] = Reason.objects.all()
-        past_works = PastWork.objects.order_by('-date_modified').all()
-        past_works_paginator = Paginator(past_works, 2)
-        context['pastworks'] = past_works_paginator.get_page(1)
+        context['pastworks'] = SimpleLazyObject(lambda: keyset_page(
+            PastWork.objects.all(), PastWorksView.ordering, PastWorksView.paginate_by))
+        context['fragment_versions'] = dict(zip(('pastwork', 'reason'), get_content_versions(PastWork, Reason)))
+        context['fragment_cache_seconds'] = settings.FRAGMENT_CACHE_SECONDS
+        context.setdefault('form_rendered_at', form_timestamp())
         return context
 
 
@@ -83,43 +103,179 @@ class DeleteReasonView(LoginRequiredMixin, DeleteView):
     success_url = reverse_lazy('reasons')
 
 
-class SendMessageView(SuccessMessageMixin, CreateView):
+class SendMessageView(SendMessageRateLimitMixin, SuccessMessageMixin, CreateView):
     model = Message
-    fields = ['reason', 'name', 'email', 'message']
+    form_class = MessageForm
     success_message = "Your message was sent successfully, expect a feedback ASAP!!!"
 
     def form_valid(self, form):
-        subject = 'Message from Portfolio App'
-        name_of_sender = form["name"].value()
-        reason = Reason.objects.get(id=form["reason"].value()).purpose
-        exact_message = form["message"].value()
-        sender_email = form["email"].value()
-        message = f'{name_of_sender} says {reason}\n\nTheir exact statement was "{exact_message}"\n' \
-                  f'Here is their email if you need to reach them: {sender_email}'
-        send_mail(subject, message, settings.EMAIL_HOST_USER, [f'{settings.EMAIL_RECEIVER}'], fail_silently=False)
-        return super(SendMessageView, self).form_valid(form)
-
-
-class MessagesReceivedView(LoginRequiredMixin, ListView):
+        index = RecentMessageIndex(settings.SPAM_CACHE)
+        verdict = score_submission(self.request.POST, index)
+        if not verdict.accepted:
+            # Dropped without a write or an email, and answered like a success so it teaches a bot nothing.
+            log_verdict(verdict, form.cleaned_data['email'])
+            messages.success(self.request, self.get_success_message(form.cleaned_data))
+            return redirect('home')
+        if digest_enabled():
+            response = super(SendMessageView, self).form_valid(form)
+        else:
+            form.instance.notified = True
+            with transaction.atomic():
+                response = super(SendMessageView, self).form_valid(form)
+                queue_message_notification(self.object)
+        index.add(verdict.fingerprint, form.cleaned_data['email'])
+        return response
+
+
+class MessagesReceivedView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
     model = Message
-    context_object_name = 'messages'
+    context_object_name = 'received_messages'
     template_name = 'messages_received.html'
     paginate_by = 6
-    queryset = Message.objects.order_by('-id')
+    ordering = ('-id',)
+    queryset = Message.objects.select_related('reason').only(
+        'name', 'email', 'message', 'date', 'reason__purpose')
+
+    def get_reason(self):
+        try:
+            return int(self.request.GET.get('reason', ''))
+        except ValueError:
+            return None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        reason = self.get_reason()
+        return queryset.filter(reason_id=reason) if reason else queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['selected_reason'] = self.get_reason()
+        return context
 
 
-class PastWorksView(ListView):
+class ArchivedMessagesView(LoginRequiredMixin, KeysetPaginationMixin, ListView):
+    model = ArchivedMessage
+    context_object_name = 'archived_messages'
+    template_name = 'messages_archived.html'
+    paginate_by = 6
+    ordering = ('-date', '-id')
+
+    def get_year(self):
+        try:
+            return int(self.request.GET.get('year', ''))
+        except ValueError:
+            return None
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        year = self.get_year()
+        return queryset.filter(date__year=year) if year else queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['years'] = self.get_years()
+        context['selected_year'] = self.get_year()
+        return context
+
+    def get_years(self):
+        """
+        The years with archived messages, newest first.
+
+        Each year costs one index lookup for the latest message before it
+        began, where listing the distinct years would read every date.
+        """
+        dates = ArchivedMessage.objects.order_by('-date').values_list('date', flat=True)
+        years = []
+        latest = dates.first()
+        while latest is not None:
+            year = timezone.localtime(latest).year
+            years.append(year)
+            latest = dates.filter(date__lt=timezone.make_aware(datetime(year, 1, 1))).first()
+        return years
+
+
+class PastWorksView(ConditionalGetMixin, KeysetPaginationMixin, ListView):
     model = PastWork
     context_object_name = 'pastworks'
     template_name = 'pastworks.html'
     paginate_by = 2
-    queryset = PastWork.objects.order_by('-date_modified')
+    ordering = ('-date_modified', '-id')
+    conditional_for_anonymous_only = True
+
+    def get_etag(self, request, *args, **kwargs):
+        versions = '.'.join(str(version) for version in get_content_versions(PastWork, Tool))
+        path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return f'pastworks-{versions}-{path_hash}'
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return pastworks_last_modified()
+
+    def get_selected_tools(self):
+        return sorted(set(self.request.GET.getlist('tool')))
+
+    def get_filtered_queryset(self):
+        queryset = PastWork.objects.all()
+        for slug in self.get_selected_tools():
+            queryset = queryset.filter(tools__slug=slug)
+        return queryset
+
+    def get_queryset(self):
+        return self.get_filtered_queryset().prefetch_related('tools')
+
+    def get_tool_facets(self):
+        selected = self.get_selected_tools()
+        tools = Tool.objects.filter(pastworks__in=self.get_filtered_queryset().values('id')).annotate(
+            count=Count('pastworks')).order_by('-count', 'name')
+        facets = []
+        for tool in tools:
+            toggled = [slug for slug in selected if slug != tool.slug]
+            if tool.slug not in selected:
+                toggled.append(tool.slug)
+            facets.append({'tool': tool, 'count': tool.count, 'active': tool.slug in selected,
+                           'query': urlencode({'tool': sorted(toggled)}, doseq=True)})
+        return facets
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tool_facets'] = self.get_tool_facets()
+        context['selected_tools'] = self.get_selected_tools()
+        return context
+
 
+class PastWorkSearchView(TemplateView):
+    template_name = 'pastwork_search.html'
+    paginate_by = 10
 
-class PastWorkView(DetailView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        page = get_search_backend().search(query, self.paginate_by, after=self.request.GET.get('after'),
+                                           before=self.request.GET.get('before'))
+        context['query'] = query
+        context['pastworks'] = context['page_obj'] = page
+        context['page_query'] = page_query(self.request)
+        return context
+
+
+class PastWorkView(ConditionalGetMixin, DetailView):
     model = PastWork
     context_object_name = 'pastwork'
     template_name = 'pastwork.html'
+    conditional_for_anonymous_only = True
+
+    def get_date_modified(self):
+        if not hasattr(self, '_date_modified'):
+            self._date_modified = PastWork.objects.filter(pk=self.kwargs['pk']).values_list(
+                'date_modified', flat=True).first()
+        return self._date_modified
+
+    def get_etag(self, request, *args, **kwargs):
+        date_modified = self.get_date_modified()
+        if date_modified is not None:
+            return f'pastwork-{self.kwargs["pk"]}-{date_modified.timestamp()}'
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return self.get_date_modified()
 
 
 class NewPastWorkView(LoginRequiredMixin, CreateView):
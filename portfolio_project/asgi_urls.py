@@ -0,0 +1,13 @@
+"""
+The URL configuration served by asgi.py: the read-only public pages go to
+their async views, everything else to the same views as under WSGI.
+"""
+from django.urls import path
+from portfolio import async_views
+from .urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path('', async_views.home, name='home'),
+    path('pastworks', async_views.pastworks, name='pastworks'),
+    path('pastwork/<int:pk>', async_views.pastwork, name='pastwork'),
+] + wsgi_urlpatterns
@@ -0,0 +1,19 @@
+"""
+Settings for the profile named by the DJANGO_ENV environment variable:
+``dev``, ``test`` or ``prod`` (the default, so a deploy that forgets to set
+it never runs with DEBUG on).
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILE = os.environ.get('DJANGO_ENV', 'prod')
+
+if PROFILE == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif PROFILE == 'test':
+    from .test import *  # noqa: F401,F403
+elif PROFILE == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f'DJANGO_ENV must be dev, test or prod, not {PROFILE!r}')
@@ -1,19 +1,18 @@
-import dj_database_url
 import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
 
-# Quick-start development settings - unsuitable for production
+# Settings shared by every profile; dev.py, test.py and prod.py build on these.
 # See https://docs.djangoproject.com/en/3.1/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ.get('SECRET_KEY')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = False
 ALLOWED_HOSTS = []
 
 
@@ -37,17 +36,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'portfolio.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'portfolio.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'portfolio.middleware.PrerenderedPageMiddleware',
 ]
 
-ROOT_URLCONF = 'portfolio_project.urls'
+# asgi.py sets DJANGO_SERVER=asgi, which routes the read-only pages to async views.
+ROOT_URLCONF = 'portfolio_project.asgi_urls' if os.environ.get('DJANGO_SERVER') == 'asgi' else 'portfolio_project.urls'
 
 TEMPLATES = [
     {
@@ -77,6 +79,85 @@ DATABASES = {
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
+# Seconds a persistent connection that passed a health check is trusted
+# before it is checked again, on its first query in a request.
+DB_HEALTH_CHECK_INTERVAL = 0
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+PAGE_CACHE_SECONDS = 60 * 15
+FRAGMENT_CACHE_SECONDS = 60 * 60 * 24
+RATELIMIT_CACHE = 'default'
+RATELIMIT_PROXY_COUNT = 0
+SEND_MESSAGE_RATE_LIMIT = 5
+SEND_MESSAGE_RATE_WINDOW = 60 * 60
+
+
+# Request metrics
+# Opt-in Server-Timing headers and per-request log lines from portfolio.middleware
+
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED') == 'True'
+REQUEST_QUERY_BUDGET = 10
+
+
+# Pre-rendered pages
+# Written by `manage.py prerender_pages` and served by portfolio.middleware
+
+PRERENDER_ENABLED = os.environ.get('PRERENDER_ENABLED') == 'True'
+PRERENDER_ROOT = os.environ.get('PRERENDER_ROOT', os.path.join(BASE_DIR, 'prerendered'))
+
+
+# Message retention
+# `manage.py archive_messages` moves older messages out of the inbox table
+
+MESSAGE_RETENTION_DAYS = int(os.environ.get('MESSAGE_RETENTION_DAYS', 180))
+MESSAGE_ARCHIVE_BATCH_SIZE = 1000
+
+# Spam filtering
+# portfolio.spam scores each contact form submission before it is stored
+
+SPAM_SCORE_THRESHOLD = 1.0
+SPAM_MIN_SUBMIT_SECONDS = 3
+SPAM_MAX_LINKS = 2
+SPAM_CACHE = 'default'
+SPAM_DUPLICATE_DISTANCE = 8
+SPAM_DUPLICATE_MIN_WORDS = 8
+SPAM_DUPLICATE_HISTORY = 500
+SPAM_DUPLICATE_WINDOW = 60 * 60 * 24
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'portfolio.metrics': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'portfolio.db': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'portfolio.spam': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
 
 
 # Password validation
@@ -129,23 +210,12 @@ CRISPY_TEMPLATE_PACK = 'bootstrap4'
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 EMAIL_RECEIVER = os.environ.get('EMAIL_RECEIVER')
 ADMIN_PAGE = 'admin/'
-if not DEBUG:
-    EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND_SMTP')
-    EMAIL_HOST = os.environ.get('EMAIL_HOST')
-    EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
-    EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
-    EMAIL_PORT = os.environ.get('EMAIL_PORT')
-    EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS')
-    ALLOWED_HOSTS = [f'{os.environ.get("ALLOWED_HOST_FIRST")}', ]
-    ADMIN_PAGE = os.environ.get('ADMIN_PAGE')
-    SECURE_BROWSER_XSS_FILTER = True
-    X_FRAME_OPTIONS = 'DENY'
-    CSRF_COOKIE_SECURE = True
-    SESSION_COOKIE_SECURE = True
-    SECURE_SSL_REDIRECT = True
-    SECURE_HSTS_SECONDS = 3600
-    SECURE_HSTS_INCLUDE_SUBDOMAINS = True
-    SECURE_HSTS_PRELOAD = True
-    SECURE_CONTENT_TYPE_NOSNIFF = True
-    db_from_env = dj_database_url.config(conn_max_age=500)
-    DATABASES['default'].update(db_from_env)
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_SECONDS = 60
+OUTBOX_LEASE_SECONDS = 60 * 5
+# 'each' queues an email per message; 'digest' leaves them for `manage.py send_message_digest`,
+# which sends one once MESSAGE_DIGEST_SIZE are waiting or the oldest has waited MESSAGE_DIGEST_MINUTES.
+MESSAGE_NOTIFICATIONS = os.environ.get('MESSAGE_NOTIFICATIONS', 'each')
+MESSAGE_DIGEST_MINUTES = int(os.environ.get('MESSAGE_DIGEST_MINUTES', 30))
+MESSAGE_DIGEST_SIZE = int(os.environ.get('MESSAGE_DIGEST_SIZE', 20))
+MESSAGE_DIGEST_MAX_MESSAGES = 200
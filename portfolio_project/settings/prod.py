@@ -0,0 +1,87 @@
+import dj_database_url
+
+from .base import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = [f'{os.environ.get("ALLOWED_HOST_FIRST")}', ]
+ADMIN_PAGE = os.environ.get('ADMIN_PAGE')
+
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND_SMTP')
+EMAIL_HOST = os.environ.get('EMAIL_HOST')
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
+EMAIL_PORT = os.environ.get('EMAIL_PORT')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS')
+
+SECURE_BROWSER_XSS_FILTER = True
+X_FRAME_OPTIONS = 'DENY'
+CSRF_COOKIE_SECURE = True
+SESSION_COOKIE_SECURE = True
+SECURE_SSL_REDIRECT = True
+SECURE_HSTS_SECONDS = 3600
+SECURE_HSTS_INCLUDE_SUBDOMAINS = True
+SECURE_HSTS_PRELOAD = True
+SECURE_CONTENT_TYPE_NOSNIFF = True
+
+# The settings below are rebuilt rather than edited in place so that the
+# other profiles, which share base's objects, are never changed by importing this one.
+
+# Keep database connections open across requests. Each gunicorn worker
+# thread holds at most one, so the pool is sized in gunicorn.conf.py.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', 500))
+DB_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_HEALTH_CHECK_INTERVAL', 0))
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        **dj_database_url.config(conn_max_age=DB_CONN_MAX_AGE),
+    }
+}
+
+# Content versions, rate limit counters and the spam filter's recent
+# messages must be seen by every process. Set CACHE_BACKEND and
+# CACHE_LOCATION to a memcached server shared by all dynos. The file cache
+# fallback is only shared by the processes on one dyno, its incr and add
+# are not atomic, and each set lists the whole directory. Past MAX_ENTRIES
+# it deletes a random third of the entries, so it gets far more room than
+# the default 300.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', '/tmp/portfolio_cache'),
+    }
+}
+if CACHE_BACKEND.endswith('.FileBasedCache'):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 100000))}
+# Heroku's router appends the client address to X-Forwarded-For.
+RATELIMIT_PROXY_COUNT = 1
+
+# Parse each template once per worker; gunicorn.conf.py warms them all at boot.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'context_processors': [processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+                               if processor != 'django.template.context_processors.debug'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+# Minified, content-hashed and pre-compressed by collectstatic. whitenoise
+# serves the hashed names with immutable, far-future cache headers.
+STATICFILES_STORAGE = 'portfolio.storage.MinifiedCompressedManifestStaticFilesStorage'
+
+# Leave out the opt-in middleware that is switched off, rather than have it
+# bow out with MiddlewareNotUsed when each worker starts.
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if not (middleware == 'portfolio.middleware.RequestMetricsMiddleware' and not REQUEST_METRICS_ENABLED)
+    and not (middleware == 'portfolio.middleware.PrerenderedPageMiddleware' and not PRERENDER_ENABLED)
+]
@@ -0,0 +1,14 @@
+import dj_database_url
+
+from .base import *  # noqa: F401,F403
+
+SECRET_KEY = os.environ.get('SECRET_KEY', 'portfolio-test-secret-key')
+
+# Hashing with the real hashers dominates the run time of tests that log users in.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# Set DATABASE_URL to run the suite, query plan tests included, against a local Postgres.
+if os.environ.get('DATABASE_URL'):
+    DATABASES = {'default': dj_database_url.config()}